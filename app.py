@@ -1,15 +1,41 @@
 import asyncio
+import base64
+import bisect
+import json
+import math
 import os
+import sys
 import time
+import uuid
 import csv
-from io import StringIO, BytesIO
-from typing import List, Dict, Any, Optional, Tuple, Union
-from quart import Quart, request, jsonify, render_template, send_from_directory, Response, send_file, ResponseReturnValue
-from aiohttp import ClientSession, ClientTimeout, ClientResponseError, ServerDisconnectedError, TooManyRedirects
-from cachetools import TTLCache
+from abc import ABC, abstractmethod
+from io import StringIO
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Callable, Deque, Iterable, NamedTuple, Optional, Set, Tuple, Union
+from quart import Quart, request, jsonify, render_template, send_from_directory, Response, ResponseReturnValue
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, ClientResponseError, ServerDisconnectedError, TooManyRedirects
+from cachetools import Cache, LRUCache, TLRUCache, TTLCache
 import logging
+import sqlite3
+import click
+import zlib
 from logging.config import dictConfig
-from functools import wraps
+from email.utils import parsedate_to_datetime
+from functools import partial, wraps
+from bulk_index import BulkCardIndex, build_index
+from card_store import CardRow, SQLiteCardStore, normalize_card_name
+from queue_store import QueueEntry, SQLiteQueueStore
+from tinylfu import WTinyLFUCache
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstd exports are only offered when zstandard is installed
+    zstandard = None
 
 # Logging configuration
 dictConfig({
@@ -32,61 +58,635 @@ logger = logging.getLogger(__name__)
 
 class Config:
     API_BASE_URL: str = "https://api.scryfall.com/cards/named"
+    COLLECTION_URL: str = "https://api.scryfall.com/cards/collection"
+    COLLECTION_BATCH_SIZE: int = 75
+    USE_COLLECTION_FETCH: bool = True
     REQUEST_TIMEOUT: float = 30.0
     MAX_RETRIES: int = 3
     RATE_LIMIT_DELAY: float = 0.1
+    UPSTREAM_MIN_INTERVAL: float = 0.05
+    UPSTREAM_MAX_INTERVAL: float = 5.0
+    UPSTREAM_RATE_INCREASE: float = 0.1
+    UPSTREAM_DEFAULT_RETRY_AFTER: float = 1.0
     MAX_QUEUE_SIZE: int = 1000
-    BATCH_SIZE: int = 10
+    BATCH_SIZE: int = 10  # Names per batch for per-name fetches; collection fetches use COLLECTION_BATCH_SIZE
+    BATCH_LINGER: float = 0.05
+    # Lanes in priority order, with their weighted fair share of dequeues
+    QUEUE_LANES: Dict[str, int] = {'interactive': 8, 'bulk': 2, 'background': 1}
+    INTERACTIVE_MAX_CARDS: int = 20
+    # Most names one client may have waiting in the queue across all lanes
+    CLIENT_QUEUE_QUOTA: int = 200
+    QUEUE_FULL_RETRY_AFTER: int = 5
     CACHE_SIZE: int = 1000
-    CACHE_TTL: int = 86400
+    # 'ttl' evicts in insertion order; 'tinylfu' only admits a new card over a
+    # more popular one, so large exports of rare cards cannot flush the staples
+    CACHE_POLICY: str = 'ttl'
+    # Trades a decompression per read for smaller long rules texts in memory
+    COMPRESS_ORACLE_TEXT: bool = False
+    COMPRESS_MIN_LENGTH: int = 256
+    # Keep each card's serialized JSON next to it, at the cost of roughly one
+    # more copy of its text, so unchanged cards are never serialized twice.
+    # Ignored with COMPRESS_ORACLE_TEXT, whose savings the copy would undo.
+    MEMOIZE_CARD_JSON: bool = True
+    # Cards older than the soft TTL are served while a background refresh
+    # runs; only past the hard CACHE_TTL are they dropped and fetched again
+    CACHE_SOFT_TTL: int = 86400
+    CACHE_TTL: int = 604800
+    REFRESH_LANE: str = 'background'
+    # Cards that were not found, or failed to fetch, are kept apart from found
+    # cards for a much shorter time; failures are retried with backoff.
+    NEGATIVE_CACHE_SIZE: int = 1000
+    NOT_FOUND_TTL: int = 3600
+    ERROR_TTL: int = 60
+    ERROR_RETRY_DELAY: float = 5.0
+    ERROR_MAX_RETRIES: int = 3
+    ALIAS_CACHE_SIZE: int = 5000
+    TOMBSTONE_LIMIT: int = 5000
+    L2_CACHE_PATH: Optional[str] = "card_cache.db"
+    L2_CACHE_TTL: int = 604800
+    L2_FLUSH_INTERVAL: float = 1.0
+    L2_FLUSH_BATCH_SIZE: int = 500
+    L2_PURGE_INTERVAL: float = 3600.0
+    L2_WARM_ENTRIES: int = 1000
+    BULK_INDEX_PATH: Optional[str] = "oracle_index.db"
+    BULK_DATA_PATH: Optional[str] = None
+    BULK_INDEX_RELOAD_INTERVAL: float = 5.0
+    # Queued names are persisted at most QUEUE_FLUSH_INTERVAL after being accepted
+    QUEUE_STORE_PATH: Optional[str] = "card_queue.db"
+    QUEUE_FLUSH_INTERVAL: float = 0.5
+    QUEUE_COMPACT_INTERVAL: float = 600.0
     HOST: str = "0.0.0.0"
     PORT: int = 8080
     DEBUG: bool = False
     RATE_LIMIT: int = 10
     RATE_LIMIT_PERIOD: int = 60
+    RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_MAX_CLIENTS: int = 10000
+    # Only keys listed in API_KEYS get their own rate limit bucket and queue
+    # quota; any other value would let a client pick a fresh bucket per request
+    API_KEY_HEADER: Optional[str] = "X-API-Key"
+    API_KEYS: Set[str] = set()
     MAX_CONCURRENT_REQUESTS: int = 5
+    CONCURRENT_PROCESSING: bool = True
+    MAX_PENDING_BATCHES: int = 2
+    WORKER_COUNT: int = 3
+    WORKER_STOP_TIMEOUT: float = 60.0
+    EXPORT_CHUNK_SIZE: int = 64 * 1024
+    # Compress exports with the best Content-Encoding the client accepts
+    EXPORT_COMPRESSION: bool = True
+    CARDS_PAGE_SIZE: int = 100
+    CARDS_MAX_PAGE_SIZE: int = 1000
+    CONNECTOR_LIMIT: int = 100
+    CONNECTOR_LIMIT_PER_HOST: int = 10
+    KEEPALIVE_TIMEOUT: float = 30.0
+    DNS_CACHE_TTL: int = 300
+    SSE_HEARTBEAT_INTERVAL: float = 15.0
+    SSE_MAX_PENDING_EVENTS: int = 1000
+    MAX_JOBS: int = 1000
+    JOB_TTL: int = 3600
 
 app = Quart(__name__, static_folder='static', template_folder='templates')
 app.config.from_object(Config)
 
-card_cache: TTLCache = TTLCache(maxsize=Config.CACHE_SIZE, ttl=Config.CACHE_TTL)
-
 class RateLimiter:
-    def __init__(self, limit: int, period: int):
+    # Generic cell rate algorithm: only the theoretical arrival time of the
+    # next request is stored, so each check is O(1) whatever the limit.
+    def __init__(self, limit: int, period: int, burst: Optional[int] = None):
         self.limit: int = limit
         self.period: int = period
-        self.requests: List[float] = []
+        self.burst: int = burst if burst is not None else limit
+        self.interval: float = period / limit
+        self.tolerance: float = self.interval * (self.burst - 1)
+        self.tat: float = 0.0
 
     def is_allowed(self) -> bool:
-        now: float = time.time()
-        self.requests = [t for t in self.requests if now - t < self.period]
-        if len(self.requests) < self.limit:
-            self.requests.append(now)
-            return True
-        return False
+        now: float = time.monotonic()
+        tat: float = max(self.tat, now)
+        if tat - now > self.tolerance:
+            return False
+        self.tat = tat + self.interval
+        return True
 
-rate_limiter: RateLimiter = RateLimiter(Config.RATE_LIMIT, Config.RATE_LIMIT_PERIOD)
+    def retry_after(self) -> float:
+        return max(0.0, self.tat - self.tolerance - time.monotonic())
 
-def rate_limit(f):
-    @wraps(f)
-    async def decorated_function(*args: Any, **kwargs: Any) -> ResponseReturnValue:
-        if not rate_limiter.is_allowed():
-            return jsonify(error="Rate limit exceeded"), 429
-        try:
-            return await f(*args, **kwargs)
-        except Exception as e:
-            logger.error(f"Unexpected error in rate-limited function: {e}")
-            return jsonify(error="Internal server error"), 500
-    return decorated_function
+class KeyedRateLimiter:
+    def __init__(self, limit: int, period: int, burst: Optional[int] = None, max_clients: int = 10000):
+        self.limit: int = limit
+        self.period: int = period
+        self.burst: int = burst if burst is not None else limit
+        # A bucket left idle this long has refilled completely, so dropping it
+        # loses nothing; the size bound keeps memory flat under many clients.
+        self.buckets: TTLCache = TTLCache(maxsize=max_clients, ttl=period * self.burst / limit)
+
+    def get(self, client_id: str) -> RateLimiter:
+        limiter: Optional[RateLimiter] = self.buckets.get(client_id)
+        if limiter is None:
+            limiter = RateLimiter(self.limit, self.period, self.burst)
+        self.buckets[client_id] = limiter  # Refresh the idle timeout
+        return limiter
+
+def get_client_id() -> str:
+    if Config.API_KEY_HEADER:
+        api_key: Optional[str] = request.headers.get(Config.API_KEY_HEADER)
+        if api_key and api_key in Config.API_KEYS:
+            return f"key:{api_key}"
+    return f"addr:{request.remote_addr}"
+
+def rate_limit(f=None, *, limit: Optional[int] = None, period: Optional[int] = None, burst: Optional[int] = None):
+    def decorator(f):
+        limiter: KeyedRateLimiter = KeyedRateLimiter(
+            limit if limit is not None else Config.RATE_LIMIT,
+            period if period is not None else Config.RATE_LIMIT_PERIOD,
+            burst if burst is not None else (Config.RATE_LIMIT_BURST if limit is None else None),
+            max_clients=Config.RATE_LIMIT_MAX_CLIENTS
+        )
+
+        @wraps(f)
+        async def decorated_function(*args: Any, **kwargs: Any) -> ResponseReturnValue:
+            bucket: RateLimiter = limiter.get(get_client_id())
+            if not bucket.is_allowed():
+                retry_after: int = max(1, math.ceil(bucket.retry_after()))
+                return jsonify(error="Rate limit exceeded"), 429, {'Retry-After': str(retry_after)}
+            try:
+                return await f(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Unexpected error in rate-limited function: {e}")
+                return jsonify(error="Internal server error"), 500
+        return decorated_function
+
+    # Usable both as @rate_limit and as @rate_limit(limit=..., period=...)
+    return decorator(f) if f is not None else decorator
+
+def dumps_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    return b'[' + b','.join(fragments) + b']'
+
+def json_object(fields: Dict[str, Any], **fragments: bytes) -> bytes:
+    # Serializes fields normally and splices already serialized fragments in as extra members
+    members: List[bytes] = [dumps_json(fields)[1:-1]] if fields else []
+    members.extend(dumps_json(key) + b':' + fragment for key, fragment in fragments.items())
+    return b'{' + b','.join(members) + b'}'
+
+def json_response(body: bytes) -> Response:
+    return Response(body, mimetype='application/json')
+
+def body_etag(body: bytes) -> str:
+    return f"{zlib.crc32(body):08x}-{len(body)}"
+
+def not_modified(etag: str) -> Optional[Response]:
+    # Answered with 304 for POST as well: /fetch and /export are reads that
+    # take their arguments in a JSON body
+    if not request.if_none_match.contains(etag):
+        return None
+    return with_etag(Response(status=304), etag)
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Clients may keep it, but must revalidate
+    return response
 
 class CardData:
-    def __init__(self, name: str, oracle_text: str = '', mana_cost: str = '', type_line: str = '', set_name: str = '', found: bool = True):
+    # No per-instance __dict__, and the strings many cards share are interned,
+    # so a cache of a whole Oracle set stays small
+    __slots__ = ('name', '_oracle_text', 'mana_cost', 'type_line', 'set_name', 'found', 'fetched_at', 'reason',
+                 'set_code', 'collector_number', '_json')
+    # Fields of the JSON representation, in order
+    FIELDS: Tuple[str, ...] = ('name', 'oracle_text', 'mana_cost', 'type_line', 'set_name', 'set_code',
+                               'collector_number', 'status')
+
+    def __init__(self, name: str, oracle_text: str = '', mana_cost: str = '', type_line: str = '', set_name: str = '', found: bool = True,
+                 fetched_at: Optional[float] = None, reason: Optional[str] = None, set_code: str = '', collector_number: str = ''):
+        self._json: Optional[bytes] = None
         self.name: str = name
-        self.oracle_text: str = oracle_text
-        self.mana_cost: str = mana_cost
-        self.type_line: str = type_line
-        self.set_name: str = set_name
+        self.oracle_text = oracle_text
+        self.mana_cost: str = sys.intern(mana_cost)
+        self.type_line: str = sys.intern(type_line)
+        self.set_name: str = sys.intern(set_name)
+        self.set_code: str = sys.intern(set_code)
+        self.collector_number: str = collector_number
         self.found: bool = found
+        self.fetched_at: float = fetched_at if fetched_at is not None else time.time()
+        # Why a card was not found: 'not_found' upstream, or 'error' when the fetch failed
+        self.reason: Optional[str] = None if found else (reason or 'not_found')
+
+    @property
+    def oracle_text(self) -> str:
+        text: Union[str, bytes] = self._oracle_text
+        return zlib.decompress(text).decode() if isinstance(text, bytes) else text
+
+    @oracle_text.setter
+    def oracle_text(self, text: str) -> None:
+        self._json = None
+        if Config.COMPRESS_ORACLE_TEXT and len(text) >= Config.COMPRESS_MIN_LENGTH:
+            self._oracle_text: Union[str, bytes] = zlib.compress(text.encode())
+        else:
+            self._oracle_text = text
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> 'CardData':
+        return cls(
+            name=data.get('name', ''),
+            oracle_text=data.get('oracle_text', ''),
+            mana_cost=data.get('mana_cost', ''),
+            type_line=data.get('type_line', ''),
+            set_name=data.get('set_name', ''),
+            found=True,
+            set_code=data.get('set', ''),
+            collector_number=data.get('collector_number', '')
+        )
+
+    @classmethod
+    def from_row(cls, row: CardRow, fetched_at: Optional[float] = None) -> 'CardData':
+        name, oracle_text, mana_cost, type_line, set_name, found, set_code, collector_number = row
+        return cls(name, oracle_text, mana_cost, type_line, set_name, found, fetched_at,
+                   set_code=set_code, collector_number=collector_number)
+
+    def to_row(self) -> CardRow:
+        return (self.name, self.oracle_text, self.mana_cost, self.type_line, self.set_name, self.found,
+                self.set_code, self.collector_number)
+
+    @property
+    def status(self) -> str:
+        if self.found:
+            return 'found'
+        return 'error' if self.reason == 'error' else 'not found'
+
+    def to_dict(self, fields: Iterable[str] = FIELDS) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in fields}
+
+    def to_json(self) -> bytes:
+        # Cards are replaced rather than modified when they change, so the
+        # fragment only has to be reset by the one setter that can run later
+        if self._json is not None:
+            return self._json
+        body: bytes = dumps_json(self.to_dict())
+        if Config.MEMOIZE_CARD_JSON and not Config.COMPRESS_ORACLE_TEXT:
+            self._json = body
+        return body
+
+class TrackedTTLCache(TTLCache):
+    # Reports every key dropped by capacity eviction or expiry
+    def __init__(self, maxsize: int, ttl: float, on_evict: Callable[[Any], None]):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.on_evict: Callable[[Any], None] = on_evict
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, value = super().popitem()
+        self.on_evict(key)
+        return key, value
+
+    def expire(self, time: Optional[float] = None) -> Any:
+        expired = super().expire(time)
+        for key, _ in expired or ():
+            self.on_evict(key)
+        return expired
+
+    def peek(self, key: Any) -> Any:
+        # Plain reads move the key to the most recently used end; callers
+        # check membership first, which neither reorders nor misses expiry
+        return Cache.__getitem__(self, key)
+
+class TrackedTLRUCache(TLRUCache):
+    # TLRUCache counterpart of TrackedTTLCache
+    def __init__(self, maxsize: int, ttu: Callable[[Any, Any, float], float], on_evict: Callable[[Any], None]):
+        super().__init__(maxsize=maxsize, ttu=ttu)
+        self.on_evict: Callable[[Any], None] = on_evict
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, value = super().popitem()
+        self.on_evict(key)
+        return key, value
+
+    def expire(self, time: Optional[float] = None) -> Any:
+        expired = super().expire(time)
+        for key, _ in expired or ():
+            self.on_evict(key)
+        return expired
+
+    def peek(self, key: Any) -> Any:
+        return Cache.__getitem__(self, key)  # See TrackedTTLCache.peek
+
+class CardCache:
+    def __init__(self, maxsize: int, ttl: int, soft_ttl: int, alias_maxsize: int, tombstone_limit: int,
+                 negative_maxsize: int, not_found_ttl: int, error_ttl: int, policy: str = 'ttl'):
+        # Entries are keyed by the normalized canonical card name; every input
+        # spelling that resolved to a card is remembered in a bounded alias map.
+        self.cards: Union[TrackedTTLCache, WTinyLFUCache]
+        if policy == 'tinylfu':
+            self.cards = WTinyLFUCache(maxsize, ttl, self.evicted)
+        elif policy == 'ttl':
+            self.cards = TrackedTTLCache(maxsize, ttl, self.evicted)
+        else:
+            raise ValueError(f"Unknown cache policy '{policy}'")
+        self.soft_ttl: int = soft_ttl
+        # Cards that were not found are keyed by the normalized query and never
+        # take a slot from a found card, nor reach the persistent tier
+        self.negative: TrackedTLRUCache = TrackedTLRUCache(
+            negative_maxsize,
+            lambda key, card_info, now: now + (error_ttl if card_info.reason == 'error' else not_found_ttl),
+            self.evicted
+        )
+        self.aliases: LRUCache = LRUCache(maxsize=alias_maxsize)
+        # Optional persistent second tier, written through and read through on a miss
+        self.store: Optional[SQLiteCardStore] = None
+        # Every write is stamped with the next version; changes and removals are
+        # kept in version order so deltas only walk what changed since a cursor.
+        self.version: int = 0
+        self.changes: OrderedDict[str, int] = OrderedDict()
+        self.removals: OrderedDict[str, int] = OrderedDict()
+        self.tombstone_limit: int = tombstone_limit
+        # Cursors older than this missed removals and must resynchronize fully
+        self.min_version: int = 0
+        # Versions restart with the process, so ETags also carry this epoch
+        self.epoch: str = uuid.uuid4().hex[:8]
+        # All listed keys in order, rebuilt on the next listing after a key is added or removed
+        self.sorted_keys: Optional[List[str]] = None
+
+    def insert(self, key: str, card_info: CardData) -> None:
+        if key not in self.cards:
+            self.sorted_keys = None
+        self.cards[key] = card_info
+        self.changed(key)
+
+    def changed(self, key: str) -> None:
+        self.version += 1
+        self.changes[key] = self.version
+        self.changes.move_to_end(key)
+        self.removals.pop(key, None)
+
+    def evicted(self, key: str) -> None:
+        self.sorted_keys = None
+        self.version += 1
+        self.changes.pop(key, None)
+        self.removals[key] = self.version
+        if len(self.removals) > self.tombstone_limit:
+            _, dropped = self.removals.popitem(last=False)
+            self.min_version = max(self.min_version, dropped)
+
+    def expire(self) -> None:
+        # Expiry is lazy in both tiers; expired entries count as removals
+        self.cards.expire()
+        self.negative.expire()
+
+    def cursor(self) -> str:
+        return f"{self.epoch}:{self.version}"
+
+    @staticmethod
+    def parse_cursor(cursor: str) -> Tuple[str, int]:
+        # A bare version comes from before cursors carried the epoch and always resets
+        epoch, _, version = cursor.rpartition(':')
+        return epoch, int(version)
+
+    def changes_since(self, cursor: Optional[str]) -> Dict[str, Any]:
+        self.expire()
+        epoch, since = self.parse_cursor(cursor) if cursor else ('', 0)
+        # Versions restart with the process, so a cursor from another epoch
+        # says nothing about what this cache has sent
+        if epoch != self.epoch or since < self.min_version or since > self.version:
+            return {'cursor': self.cursor(), 'reset': True, 'cards': self.values(), 'removed': []}
+
+        cards: List[CardData] = []
+        for key, version in reversed(self.changes.items()):
+            if version <= since:
+                break
+            card_info: Optional[CardData] = self.peek(key)
+            if card_info is not None:
+                cards.append(card_info)
+        removed: List[str] = []
+        for key, version in reversed(self.removals.items()):
+            if version <= since:
+                break
+            removed.append(key)
+        cards.reverse()
+        removed.reverse()
+        return {'cursor': self.cursor(), 'reset': False, 'cards': cards, 'removed': removed}
+
+    def etag(self) -> str:
+        self.expire()
+        return f"{self.epoch}-{self.version}"
+
+    def page(self, after: Optional[str], limit: int,
+             predicate: Optional[Callable[[CardData], bool]] = None) -> Tuple[List[CardData], Optional[str]]:
+        # Keyset pagination over the sorted keys of found and not-found cards:
+        # a page starts after the last key of the previous one, so cards added
+        # or removed meanwhile never shift the remaining pages.
+        self.expire()
+        if self.sorted_keys is None:
+            # Expired not-found entries linger here until the next rebuild and are skipped below
+            self.sorted_keys = sorted(set(self.cards.keys()).union(self.negative.keys()))
+        keys: List[str] = self.sorted_keys
+        cards: List[CardData] = []
+        start: int = 0 if after is None else bisect.bisect_right(keys, after)
+        for i in range(start, len(keys)):
+            card_info: Optional[CardData] = self.peek(keys[i])
+            if card_info is None or (predicate is not None and not predicate(card_info)):
+                continue
+            cards.append(card_info)
+            if len(cards) == limit:
+                return cards, keys[i] if i + 1 < len(keys) else None
+        return cards, None
+
+    def peek(self, key: str) -> Optional[CardData]:
+        # Looks a key up without counting it as an access
+        if key in self.cards:
+            return self.cards.peek(key)
+        if key in self.negative:
+            return self.negative.peek(key)
+        return None
+
+    def resolve_key(self, card_name: str) -> str:
+        key: str = normalize_card_name(card_name)
+        return self.aliases.get(key, key)
+
+    def get(self, card_name: str, default: Optional[CardData] = None) -> Optional[CardData]:
+        key: str = self.resolve_key(card_name)
+        card_info: Optional[CardData] = self.cards.get(key)
+        if card_info is None:
+            card_info = self.negative.get(key)
+        return card_info if card_info is not None else default
+
+    def is_stale(self, card_info: CardData) -> bool:
+        return time.time() - card_info.fetched_at >= self.soft_ttl
+
+    async def lookup(self, card_name: str, count_hit: bool = True) -> Optional[CardData]:
+        # Reads on behalf of a client count towards the warm-up ranking in
+        # either tier; the worker's own checks pass count_hit=False
+        card_info: Optional[CardData] = self.get(card_name)
+        if self.store is None:
+            return card_info
+        if card_info is not None:
+            if count_hit and card_info.found:
+                self.store.record_hit(self.resolve_key(card_name))
+            return card_info
+
+        try:
+            stored: Optional[Tuple[str, CardRow, float]] = await self.store.get(normalize_card_name(card_name))
+        except Exception as e:
+            logger.error(f"Error reading '{card_name}' from card store: {e}")
+            return None
+        if stored is None:
+            return None
+
+        key, row, fetched_at = stored
+        card_info = CardData.from_row(row, fetched_at)
+        self.insert(key, card_info)
+        alias: str = normalize_card_name(card_name)
+        if alias != key:
+            self.aliases[alias] = key
+        if count_hit:
+            self.store.record_hit(key)
+        return card_info
+
+    def put(self, card_name: str, card_info: CardData) -> None:
+        alias: str = normalize_card_name(card_name)
+        if not card_info.found:
+            # Stored where get() looks: a known alias resolves to the card it
+            # named, whose entry has since been evicted
+            negative_key: str = self.resolve_key(card_name)
+            if negative_key not in self.negative:
+                self.sorted_keys = None
+            self.negative[negative_key] = card_info
+            self.changed(negative_key)
+            return
+        key: str = normalize_card_name(card_info.name)
+        for negative_key in {alias, self.resolve_key(card_name)} - {key}:
+            if self.negative.pop(negative_key, None) is not None:
+                self.evicted(negative_key)  # Superseded by the found card under its own key
+        self.negative.pop(key, None)
+        self.insert(key, card_info)
+        if alias != key:
+            self.aliases[alias] = key
+        if self.store is not None:
+            self.store.put(key, [alias] if alias != key else [], card_info.to_row(), card_info.fetched_at)
+
+    async def warm(self, limit: int) -> int:
+        if self.store is None:
+            return 0
+        entries: List[Tuple[str, CardRow, float, List[str]]] = await self.store.hottest(min(limit, self.cards.maxsize))
+        for key, row, fetched_at, aliases in entries:
+            self.insert(key, CardData.from_row(row, fetched_at))
+            for alias in aliases:
+                self.aliases[alias] = key
+        return len(entries)
+
+    def __getitem__(self, card_name: str) -> CardData:
+        return self.cards[self.resolve_key(card_name)]
+
+    def __setitem__(self, card_name: str, card_info: CardData) -> None:
+        self.put(card_name, card_info)
+
+    def __contains__(self, card_name: str) -> bool:
+        return self.get(card_name) is not None
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def keys(self) -> List[str]:
+        # Found cards first, then not-found and error entries
+        return list(self.cards.keys()) + list(self.negative.keys())
+
+    def values(self) -> List[CardData]:
+        return list(self.cards.values()) + list(self.negative.values())
+
+    def clear(self) -> None:
+        self.cards.clear()
+        self.negative.clear()
+        self.aliases.clear()
+        self.changes.clear()
+        self.removals.clear()
+        self.sorted_keys = None
+        self.version += 1
+        self.min_version = self.version
+
+card_cache: CardCache = CardCache(
+    Config.CACHE_SIZE, Config.CACHE_TTL, Config.CACHE_SOFT_TTL, Config.ALIAS_CACHE_SIZE, Config.TOMBSTONE_LIMIT,
+    Config.NEGATIVE_CACHE_SIZE, Config.NOT_FOUND_TTL, Config.ERROR_TTL, Config.CACHE_POLICY
+)
+if Config.L2_CACHE_PATH:
+    card_cache.store = SQLiteCardStore(
+        Config.L2_CACHE_PATH,
+        ttl=Config.L2_CACHE_TTL,
+        flush_interval=Config.L2_FLUSH_INTERVAL,
+        flush_batch_size=Config.L2_FLUSH_BATCH_SIZE,
+        purge_interval=Config.L2_PURGE_INTERVAL
+    )
+
+class UpstreamPacer:
+    # Spaces requests from every CardManager at least `interval` apart. A 429
+    # doubles the interval and pauses everyone for Retry-After; each success
+    # adds back a fixed amount of rate (AIMD) until min_interval is reached.
+    def __init__(self, initial_interval: float, min_interval: float, max_interval: float, rate_increase: float):
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.rate_increase: float = rate_increase
+        self.interval: float = max(min_interval, initial_interval)
+        self.next_slot: float = 0.0
+        self.blocked_until: float = 0.0
+
+    async def acquire(self) -> None:
+        while True:
+            now: float = time.monotonic()
+            slot: float = max(now, self.next_slot, self.blocked_until)
+            self.next_slot = slot + self.interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            # A 429 seen while this caller slept moves the whole pool back
+            if time.monotonic() >= self.blocked_until:
+                return
+
+    def record(self, status: int, retry_after: Optional[str] = None) -> None:
+        if status == 429:
+            self.throttled(retry_after)
+        elif status < 500:
+            self.succeeded()
+
+    def succeeded(self) -> None:
+        self.interval = max(self.min_interval, 1.0 / (1.0 / self.interval + self.rate_increase))
+
+    def throttled(self, retry_after: Optional[str] = None) -> None:
+        delay: float = self.parse_retry_after(retry_after)
+        self.interval = min(self.max_interval, self.interval * 2)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        self.next_slot = max(self.next_slot, self.blocked_until)
+        logger.warning(f"Upstream throttled, pausing {delay:.1f}s and spacing requests {self.interval:.3f}s apart")
+
+    @staticmethod
+    def parse_retry_after(retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+        return Config.UPSTREAM_DEFAULT_RETRY_AFTER
+
+    def get_state(self) -> Dict[str, float]:
+        return {
+            'interval': self.interval,
+            'blocked_for': max(0.0, self.blocked_until - time.monotonic())
+        }
+
+upstream_pacer: UpstreamPacer = UpstreamPacer(
+    Config.RATE_LIMIT_DELAY,
+    Config.UPSTREAM_MIN_INTERVAL,
+    Config.UPSTREAM_MAX_INTERVAL,
+    Config.UPSTREAM_RATE_INCREASE
+)
+
+bulk_index: Optional[BulkCardIndex] = (
+    BulkCardIndex(Config.BULK_INDEX_PATH, reload_interval=Config.BULK_INDEX_RELOAD_INTERVAL)
+    if Config.BULK_INDEX_PATH else None
+)
+
+background_tasks: Set[asyncio.Task[Any]] = set()
 
 class CardManager:
     def __init__(self):
@@ -95,38 +695,53 @@ class CardManager:
 
     async def __aenter__(self) -> 'CardManager':
         if self.session is None or self.session.closed:
-            self.session = ClientSession(timeout=ClientTimeout(total=Config.REQUEST_TIMEOUT))
+            connector: TCPConnector = TCPConnector(
+                limit=Config.CONNECTOR_LIMIT,
+                limit_per_host=Config.CONNECTOR_LIMIT_PER_HOST,
+                keepalive_timeout=Config.KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=Config.DNS_CACHE_TTL
+            )
+            self.session = ClientSession(timeout=ClientTimeout(total=Config.REQUEST_TIMEOUT), connector=connector)
         return self
 
     async def __aexit__(self, exc_type: Optional[type], exc_val: Optional[Exception], exc_tb: Optional[Any]) -> None:
         if self.session and not self.session.closed:
             await self.session.close()
 
+    def lookup_offline(self, card_name: str) -> Optional[CardData]:
+        if bulk_index is None:
+            return None
+        try:
+            row: Optional[CardRow] = bulk_index.lookup(card_name)
+        except sqlite3.Error as e:
+            logger.error(f"Error looking up '{card_name}' in bulk card index: {e}")
+            return None
+        return CardData.from_row(row) if row is not None else None
+
     async def fetch_card_info(self, card_name: str) -> CardData:
         if not self.session or self.session.closed:
             raise RuntimeError("CardManager session is not initialized or has been closed")
 
+        offline: Optional[CardData] = self.lookup_offline(card_name)
+        if offline is not None:
+            logger.info(f"Found '{card_name}' in bulk card index")
+            return offline
+
         params: Dict[str, str] = {"fuzzy": card_name}
 
         async with self.semaphore:
             for attempt in range(Config.MAX_RETRIES):
                 try:
-                    await asyncio.sleep(Config.RATE_LIMIT_DELAY)
+                    await upstream_pacer.acquire()
                     async with self.session.get(Config.API_BASE_URL, params=params) as response:
+                        upstream_pacer.record(response.status, response.headers.get('Retry-After'))
                         if response.status == 404:
                             logger.info(f"Card '{card_name}' not found in the API")
                             return CardData(name=card_name, found=False)
                         response.raise_for_status()
                         data: Dict[str, Any] = await response.json()
                         logger.info(f"Successfully fetched data for '{card_name}'")
-                        return CardData(
-                            name=data.get('name', ''),
-                            oracle_text=data.get('oracle_text', ''),
-                            mana_cost=data.get('mana_cost', ''),
-                            type_line=data.get('type_line', ''),
-                            set_name=data.get('set_name', ''),
-                            found=True
-                        )
+                        return CardData.from_api(data)
                 except ClientResponseError as e:
                     if e.status == 404:
                         logger.info(f"Card '{card_name}' not found in the API")
@@ -134,111 +749,694 @@ class CardManager:
                     logger.warning(f"Attempt {attempt + 1} failed for card '{card_name}': {e}")
                     if attempt == Config.MAX_RETRIES - 1:
                         logger.error(f"All attempts failed for card '{card_name}': {e}")
-                        return CardData(name=card_name, found=False)
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                        return CardData(name=card_name, found=False, reason='error')
+                    if e.status != 429:  # The pacer already holds every caller back after a 429
+                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 except (ServerDisconnectedError, TooManyRedirects, asyncio.TimeoutError) as e:
                     logger.error(f"Network error while fetching card '{card_name}': {e}")
                     if attempt == Config.MAX_RETRIES - 1:
-                        return CardData(name=card_name, found=False)
+                        return CardData(name=card_name, found=False, reason='error')
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 except Exception as e:
                     logger.error(f"Unexpected error fetching card '{card_name}': {e}")
-                    return CardData(name=card_name, found=False)
+                    return CardData(name=card_name, found=False, reason='error')
+
+        return CardData(name=card_name, found=False, reason='error')
+
+    @staticmethod
+    def failed_collection(card_names: List[str]) -> Tuple[Dict[str, CardData], List[str]]:
+        # The request itself failed, so nothing was looked up; the fuzzy
+        # endpoint is for names a successful lookup missed, and the error
+        # results are retried with backoff instead
+        return {name: CardData(name=name, found=False, reason='error') for name in card_names}, []
+
+    async def fetch_collection(self, card_names: List[str]) -> Tuple[Dict[str, CardData], List[str]]:
+        if not self.session or self.session.closed:
+            raise RuntimeError("CardManager session is not initialized or has been closed")
+
+        payload: Dict[str, Any] = {"identifiers": [{"name": name} for name in card_names]}
+
+        async with self.semaphore:
+            for attempt in range(Config.MAX_RETRIES):
+                try:
+                    await upstream_pacer.acquire()
+                    async with self.session.post(Config.COLLECTION_URL, json=payload) as response:
+                        upstream_pacer.record(response.status, response.headers.get('Retry-After'))
+                        response.raise_for_status()
+                        data: Dict[str, Any] = await response.json()
+                    break
+                except ClientResponseError as e:
+                    logger.warning(f"Attempt {attempt + 1} failed for collection of {len(card_names)} cards: {e}")
+                    if attempt == Config.MAX_RETRIES - 1:
+                        logger.error(f"All attempts failed for collection of {len(card_names)} cards: {e}")
+                        return self.failed_collection(card_names)
+                    if e.status != 429:  # The pacer already holds every caller back after a 429
+                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                except (ServerDisconnectedError, TooManyRedirects, asyncio.TimeoutError) as e:
+                    logger.error(f"Network error while fetching collection of {len(card_names)} cards: {e}")
+                    if attempt == Config.MAX_RETRIES - 1:
+                        return self.failed_collection(card_names)
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                except Exception as e:
+                    logger.error(f"Unexpected error fetching collection of {len(card_names)} cards: {e}")
+                    return self.failed_collection(card_names)
+            else:
+                return self.failed_collection(card_names)
+
+        # Exact name matches come back in arbitrary order, so index them by
+        # the full name and by each face of multi-faced cards.
+        by_name: Dict[str, CardData] = {}
+        for card_json in data.get('data', []):
+            card: CardData = CardData.from_api(card_json)
+            full_name: str = card_json.get('name', '')
+            by_name[normalize_card_name(full_name)] = card
+            for face_name in full_name.split(' // '):
+                by_name.setdefault(normalize_card_name(face_name), card)
+
+        not_found: int = len(data.get('not_found', []))
+        if not_found:
+            logger.info(f"{not_found} of {len(card_names)} cards not matched exactly in collection lookup")
+
+        found: Dict[str, CardData] = {}
+        missed: List[str] = []
+        for name in card_names:
+            card_info: Optional[CardData] = by_name.get(normalize_card_name(name))
+            if card_info is not None:
+                found[name] = card_info
+            else:
+                missed.append(name)
+        return found, missed
+
+    async def fetch_card_batch(self, card_names: List[str]) -> Dict[str, CardData]:
+        results: Dict[str, CardData] = {}
+        missed: List[str] = []
+        unique_names: List[str] = []
+        for name in dict.fromkeys(card_names):
+            offline: Optional[CardData] = self.lookup_offline(name)
+            if offline is not None:
+                results[name] = offline
+            else:
+                unique_names.append(name)
+        if results:
+            logger.info(f"Found {len(results)} of {len(card_names)} cards in bulk card index")
+
+        for i in range(0, len(unique_names), Config.COLLECTION_BATCH_SIZE):
+            chunk: List[str] = unique_names[i:i + Config.COLLECTION_BATCH_SIZE]
+            found, chunk_missed = await self.fetch_collection(chunk)
+            results.update(found)
+            missed.extend(chunk_missed)
+
+        # Typos and partial names only resolve through the fuzzy endpoint
+        if Config.CONCURRENT_PROCESSING:
+            fuzzy_results: List[CardData] = await asyncio.gather(*(self.fetch_card_info(name) for name in missed))
+            results.update(zip(missed, fuzzy_results))
+        else:
+            for name in missed:
+                results[name] = await self.fetch_card_info(name)
+
+        return results
+
+class EventBroker:
+    def __init__(self, max_pending: int):
+        self.max_pending: int = max_pending
+        self.subscribers: Set[asyncio.Queue[Optional[str]]] = set()
+
+    def subscribe(self) -> asyncio.Queue[Optional[str]]:
+        subscriber: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=self.max_pending)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue[Optional[str]]) -> None:
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        if not self.subscribers:
+            return
+        message: str = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.put_nowait(message)
+            except asyncio.QueueFull:
+                # A client this far behind is disconnected; EventSource reconnects
+                # and resynchronizes from a full listing.
+                logger.warning("Dropping slow event stream subscriber")
+                self.subscribers.discard(subscriber)
+                subscriber.get_nowait()
+                subscriber.put_nowait(None)
+
+event_broker: EventBroker = EventBroker(Config.SSE_MAX_PENDING_EVENTS)
+
+class Job:
+    def __init__(self, job_id: str, card_names: List[str]):
+        self.job_id: str = job_id
+        self.card_names: List[str] = card_names
+        self.created_at: float = time.time()
+        self.completed_at: Optional[float] = None
+        self.results: Dict[str, CardData] = {}
+        self.found: int = 0
+        self.not_found: int = 0
+        self.failed: int = 0
+
+    def record(self, card_name: str, card_info: Optional[CardData]) -> None:
+        if card_name in self.results:
+            return
+        if card_info is None:
+            self.failed += 1
+            card_info = CardData(name=card_name, found=False, reason='error')
+        elif card_info.reason == 'error':
+            self.failed += 1
+        elif card_info.found:
+            self.found += 1
+        else:
+            self.not_found += 1
+        self.results[card_name] = card_info
+        if self.completed == len(self.card_names):
+            self.completed_at = time.time()
+
+    def watch(self, card_name: str, future: asyncio.Future[CardData]) -> None:
+        def resolved(done: asyncio.Future[CardData]) -> None:
+            self.record(card_name, None if done.cancelled() else done.result())
+        future.add_done_callback(resolved)
+
+    @property
+    def completed(self) -> int:
+        return len(self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': 'complete' if self.completed_at is not None else 'running',
+            'total': len(self.card_names),
+            'completed': self.completed,
+            'found': self.found,
+            'not_found': self.not_found,
+            'failed': self.failed,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at
+        }
+
+    def get_results(self) -> List[bytes]:
+        return [
+            self.results[name].to_json() if name in self.results else dumps_json({'name': name, 'status': 'queued'})
+            for name in self.card_names
+        ]
+
+class JobTracker:
+    def __init__(self, max_jobs: int, ttl: int):
+        self.jobs: TTLCache = TTLCache(maxsize=max_jobs, ttl=ttl)
+
+    def create(self, card_names: List[str]) -> Job:
+        job: Job = Job(uuid.uuid4().hex, list(dict.fromkeys(card_names)))
+        self.jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+job_tracker: JobTracker = JobTracker(Config.MAX_JOBS, Config.JOB_TTL)
+
+class QueueItem(NamedTuple):
+    name: str
+    lane: str
+    client: str = ''
+    entry_id: int = 0  # Position in the queue store, 0 when it is not persisted
+    refresh: bool = False  # Fetch even though the card is cached
+
+class FairLane:
+    # Separate FIFO per client, served round robin, so a client with a large
+    # backlog only gets every other turn once someone else is waiting too.
+    def __init__(self):
+        self.clients: OrderedDict[str, Deque[QueueItem]] = OrderedDict()
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, item: QueueItem) -> None:
+        items: Optional[Deque[QueueItem]] = self.clients.get(item.client)
+        if items is None:
+            items = self.clients[item.client] = deque()
+        items.append(item)
+        self.size += 1
+
+    def popleft(self) -> QueueItem:
+        if not self.clients:
+            raise IndexError("pop from empty FairLane")
+        client, items = next(iter(self.clients.items()))
+        item: QueueItem = items.popleft()
+        if items:
+            self.clients.move_to_end(client)
+        else:
+            del self.clients[client]
+        self.size -= 1
+        return item
 
-        return CardData(name=card_name, found=False)
+class WeightedLanes:
+    # Separate FIFO per lane, dequeued by smooth weighted round robin so each
+    # non-empty lane gets its weight's share and none of them starves.
+    def __init__(self, weights: Dict[str, int]):
+        self.weights: Dict[str, int] = weights
+        self.lanes: Dict[str, FairLane] = {lane: FairLane() for lane in weights}
+        self.credits: Dict[str, int] = {lane: 0 for lane in weights}
+        self.client_sizes: Dict[str, int] = {}
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, item: QueueItem) -> None:
+        self.lanes[item.lane].append(item)
+        self.client_sizes[item.client] = self.client_sizes.get(item.client, 0) + 1
+        self.size += 1
+
+    def popleft(self) -> QueueItem:
+        active: List[str] = [lane for lane, items in self.lanes.items() if items]
+        if not active:
+            raise IndexError("pop from empty WeightedLanes")
+        for lane in active:
+            self.credits[lane] += self.weights[lane]
+        chosen: str = max(active, key=lambda lane: self.credits[lane])
+        self.credits[chosen] -= sum(self.weights[lane] for lane in active)
+        item: QueueItem = self.lanes[chosen].popleft()
+        if not self.lanes[chosen]:
+            self.credits[chosen] = 0
+        remaining: int = self.client_sizes.pop(item.client) - 1
+        if remaining:
+            self.client_sizes[item.client] = remaining
+        self.size -= 1
+        return item
+
+    def lane_sizes(self) -> Dict[str, int]:
+        return {lane: len(items) for lane, items in self.lanes.items()}
+
+class LaneQueue(asyncio.Queue):
+    # asyncio.Queue over WeightedLanes instead of a deque, the same way the
+    # standard PriorityQueue swaps in a heap.
+    def __init__(self, maxsize: int, weights: Dict[str, int]):
+        self.weights: Dict[str, int] = weights
+        super().__init__(maxsize=maxsize)
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: WeightedLanes = WeightedLanes(self.weights)
+
+    def _put(self, item: QueueItem) -> None:
+        self._queue.append(item)
+
+    def _get(self) -> QueueItem:
+        return self._queue.popleft()
+
+    def lane_sizes(self) -> Dict[str, int]:
+        return self._queue.lane_sizes()
+
+    def client_size(self, client: str) -> int:
+        return self._queue.client_sizes.get(client, 0)
+
+    def client_count(self) -> int:
+        return len(self._queue.client_sizes)
+
+def lane_rank(lane: str) -> int:
+    return list(Config.QUEUE_LANES).index(lane)
 
 class QueueWorker:
     def __init__(self):
-        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=Config.MAX_QUEUE_SIZE)
+        self.queue: LaneQueue = LaneQueue(Config.MAX_QUEUE_SIZE, Config.QUEUE_LANES)
         self.is_running: bool = False
-        self.worker_task: Optional[asyncio.Task[None]] = None
+        self.worker_tasks: List[asyncio.Task[None]] = []
+        self.worker_states: Dict[int, Dict[str, Any]] = {}
+        self.card_manager: Optional[CardManager] = None
+        # One shared future per normalized name that is queued or being fetched
+        self.in_flight: Dict[str, asyncio.Future[CardData]] = {}
+        # Best lane a name is queued in, or None once a worker has claimed it
+        self.queued_lanes: Dict[str, Optional[str]] = {}
+        self.store: Optional[SQLiteQueueStore] = None
+        # Failed fetches waiting for a background retry, by normalized name
+        self.retry_attempts: Dict[str, int] = {}
+        self.retry_handles: Dict[str, asyncio.TimerHandle] = {}
 
     async def start(self) -> None:
         if not self.is_running:
             self.is_running = True
-            self.worker_task = asyncio.create_task(self.process_queue())
-            logger.info("Queue worker started")
+            # All workers share one CardManager, so they share its connection
+            # pool and its MAX_CONCURRENT_REQUESTS semaphore.
+            self.card_manager = await CardManager().__aenter__()
+            self.worker_states = {
+                worker_id: {'worker_id': worker_id, 'state': 'idle', 'batches_in_flight': 0, 'cards_processed': 0}
+                for worker_id in range(Config.WORKER_COUNT)
+            }
+            self.worker_tasks = [
+                asyncio.create_task(self.process_queue(worker_id)) for worker_id in range(Config.WORKER_COUNT)
+            ]
+            logger.info(f"Queue worker started with {Config.WORKER_COUNT} workers")
 
-    async def stop(self) -> None:
+    async def stop(self, drain: bool = True) -> None:
         if self.is_running:
+            if drain:
+                try:
+                    await asyncio.wait_for(self.queue.join(), timeout=Config.WORKER_STOP_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Queue not drained after {Config.WORKER_STOP_TIMEOUT}s, stopping anyway")
             self.is_running = False
-            if self.worker_task:
+            if self.worker_tasks:
                 try:
-                    await asyncio.wait_for(self.worker_task, timeout=60.0)
+                    await asyncio.wait_for(asyncio.gather(*self.worker_tasks), timeout=Config.WORKER_STOP_TIMEOUT)
                 except asyncio.TimeoutError:
-                    logger.warning("Queue worker did not stop gracefully, forcing stop")
-                    self.worker_task.cancel()
+                    logger.warning("Queue workers did not stop gracefully, forcing stop")
+                    for task in self.worker_tasks:
+                        task.cancel()
                 except Exception as e:
-                    logger.error(f"Error stopping queue worker: {e}")
+                    logger.error(f"Error stopping queue workers: {e}")
+            self.worker_tasks = []
+            if self.card_manager:
+                await self.card_manager.__aexit__(None, None, None)
+                self.card_manager = None
+            for handle in self.retry_handles.values():
+                handle.cancel()
+            self.retry_handles.clear()
+            self.retry_attempts.clear()
+            for state in self.worker_states.values():
+                state['state'] = 'stopped'
             logger.info("Queue worker stopped")
 
-    async def process_queue(self) -> None:
-        async with CardManager() as card_manager:
-            while self.is_running:
+    async def process_queue(self, worker_id: int) -> None:
+        card_manager: Optional[CardManager] = self.card_manager
+        if card_manager is None:
+            raise RuntimeError("QueueWorker started without a CardManager")
+
+        state: Dict[str, Any] = self.worker_states[worker_id]
+        pending: Set[asyncio.Task[None]] = set()
+
+        def batch_done(size: int, task: asyncio.Task[None]) -> None:
+            pending.discard(task)
+            state['cards_processed'] += size
+            state['batches_in_flight'] = len(pending)
+            if not pending:
+                state['state'] = 'idle'
+
+        while self.is_running:
+            try:
+                batch: List[QueueItem] = await self.drain_batch()
+
+                if not batch:
+                    await asyncio.sleep(0.1)
+                    continue
+
+                logger.info(f"Worker {worker_id} processing batch of {len(batch)} cards")
+                state['state'] = 'processing'
+                if not Config.CONCURRENT_PROCESSING:
+                    await self.process_batch(card_manager, batch)
+                    state['cards_processed'] += len(batch)
+                    state['state'] = 'idle'
+                    continue
+
+                # Keep draining while the stragglers of earlier batches finish;
+                # the CardManager semaphore bounds the actual request concurrency.
+                task: asyncio.Task[None] = asyncio.create_task(self.process_batch(card_manager, batch))
+                pending.add(task)
+                state['batches_in_flight'] = len(pending)
+                task.add_done_callback(partial(batch_done, len(batch)))
+                if len(pending) >= Config.MAX_PENDING_BATCHES:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            except asyncio.CancelledError:
+                logger.info(f"Queue processing cancelled for worker {worker_id}")
+                break
+            except Exception as e:
+                logger.error(f"Unexpected error in process_queue for worker {worker_id}: {e}")
+                await asyncio.sleep(1)
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def drain_batch(self) -> List[QueueItem]:
+        batch: List[QueueItem] = []
+        try:
+            item: QueueItem = await asyncio.wait_for(self.queue.get(), timeout=1.0)
+        except asyncio.TimeoutError:
+            return batch
+
+        # Top the batch up with whatever arrives within BATCH_LINGER rather
+        # than waiting for a full batch, so small lookups are not held back.
+        deadline: float = time.monotonic() + Config.BATCH_LINGER
+        # A collection request takes up to COLLECTION_BATCH_SIZE names, so a
+        # smaller batch would only cost extra requests
+        batch_size: int = Config.COLLECTION_BATCH_SIZE if Config.USE_COLLECTION_FETCH else Config.BATCH_SIZE
+        while True:
+            if self.claim(item):
+                batch.append(item)
+            if len(batch) >= batch_size:
+                break
+            try:
+                item = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
                 try:
-                    batch: List[str] = []
-                    for _ in range(Config.BATCH_SIZE):
-                        try:
-                            card_name: str = await asyncio.wait_for(self.queue.get(), timeout=1.0)
-                            batch.append(card_name)
-                        except asyncio.TimeoutError:
-                            break
-                        except Exception as e:
-                            logger.error(f"Error getting item from queue: {e}")
-                            continue
-
-                    if not batch:
-                        await asyncio.sleep(0.1)
-                        continue
-
-                    logger.info(f"Processing batch of {len(batch)} cards")
-                    for card_name in batch:
-                        try:
-                            if card_name not in card_cache:
-                                logger.info(f"Fetching data for '{card_name}'")
-                                card_info: CardData = await card_manager.fetch_card_info(card_name)
-                                if card_info.found:
-                                    logger.info(f"Successfully cached data for '{card_name}'")
-                                else:
-                                    logger.info(f"No data found for '{card_name}', caching as not found")
-                                card_cache[card_name] = card_info
-                            else:
-                                logger.info(f"Data for '{card_name}' found in cache")
-                        except Exception as e:
-                            logger.error(f"Error processing card '{card_name}': {e}")
-                        finally:
-                            self.queue.task_done()  # Always mark the task as done, even if there was an error
-
-                except asyncio.CancelledError:
-                    logger.info("Queue processing cancelled")
+                    item = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
                     break
-                except Exception as e:
-                    logger.error(f"Unexpected error in process_queue: {e}")
-                    await asyncio.sleep(1)
+            except Exception as e:
+                logger.error(f"Error getting item from queue: {e}")
+                break
+        return batch
+
+    def claim(self, item: QueueItem) -> bool:
+        # A name promoted to a faster lane is queued twice; whichever copy is
+        # dequeued first does the work and the other is dropped here.
+        key: str = normalize_card_name(item.name)
+        if key not in self.in_flight or self.queued_lanes.get(key) is None:
+            self.task_done(item)
+            return False
+        self.queued_lanes[key] = None
+        return True
+
+    async def process_batch(self, card_manager: CardManager, batch: List[QueueItem]) -> None:
+        if not Config.USE_COLLECTION_FETCH:
+            if Config.CONCURRENT_PROCESSING:
+                await asyncio.gather(*(self.process_card(card_manager, item) for item in batch))
+            else:
+                for item in batch:
+                    await self.process_card(card_manager, item)
+            return
 
-    async def add_to_queue(self, card_name: str) -> bool:
         try:
-            await asyncio.wait_for(self.queue.put(card_name), timeout=5.0)
+            missing: List[QueueItem] = []
+            for item in batch:
+                if not item.refresh and await card_cache.lookup(item.name, count_hit=False) is not None:
+                    logger.info(f"Data for '{item.name}' found in cache")
+                else:
+                    missing.append(item)
+
+            if missing:
+                logger.info(f"Fetching data for {len(missing)} cards")
+                results: Dict[str, CardData] = await card_manager.fetch_card_batch([item.name for item in missing])
+                for item in missing:
+                    card_info: CardData = results.get(item.name) or CardData(name=item.name, found=False, reason='error')
+                    self.store_result(item, card_info)
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(batch)} cards: {e}")
+        finally:
+            for item in batch:
+                self.complete(item)  # Always mark every task as done, even if there was an error
+
+    async def process_card(self, card_manager: CardManager, item: QueueItem) -> None:
+        try:
+            if item.refresh or await card_cache.lookup(item.name, count_hit=False) is None:
+                logger.info(f"Fetching data for '{item.name}'")
+                card_info: CardData = await card_manager.fetch_card_info(item.name)
+                self.store_result(item, card_info)
+            else:
+                logger.info(f"Data for '{item.name}' found in cache")
+        except Exception as e:
+            logger.error(f"Error processing card '{item.name}': {e}")
+        finally:
+            self.complete(item)  # Always mark the task as done, even if there was an error
+
+    def store_result(self, item: QueueItem, card_info: CardData) -> None:
+        if item.refresh and not card_info.found:
+            stale: Optional[CardData] = card_cache.get(item.name)
+            if stale is not None and stale.found:
+                # Keep serving the cached card, and try again after another soft TTL
+                # rather than on every request
+                logger.warning(f"Refresh of '{item.name}' failed, keeping the cached card")
+                stale.fetched_at = time.time()
+                return
+        if card_info.found:
+            logger.info(f"Successfully cached data for '{item.name}'")
+        elif card_info.reason == 'error':
+            logger.info(f"Fetching '{item.name}' failed, caching the error briefly")
+        else:
+            logger.info(f"No data found for '{item.name}', caching as not found")
+        card_cache[item.name] = card_info
+        if card_info.reason == 'error':
+            self.schedule_retry(item.name)
+        else:
+            self.retry_attempts.pop(normalize_card_name(item.name), None)
+
+    def schedule_retry(self, card_name: str) -> None:
+        key: str = normalize_card_name(card_name)
+        attempts: int = self.retry_attempts.get(key, 0) + 1
+        if attempts > Config.ERROR_MAX_RETRIES:
+            logger.warning(f"Giving up on '{card_name}' after {Config.ERROR_MAX_RETRIES} retries")
+            self.retry_attempts.pop(key, None)
+            return
+        self.retry_attempts[key] = attempts
+        delay: float = Config.ERROR_RETRY_DELAY * 2 ** (attempts - 1)
+        self.retry_handles[key] = asyncio.get_running_loop().call_later(delay, self.retry, card_name)
+
+    def retry(self, card_name: str) -> None:
+        self.retry_handles.pop(normalize_card_name(card_name), None)
+        if self.is_running:
+            task: asyncio.Task[bool] = asyncio.create_task(self.refresh(card_name))
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+
+    def complete(self, item: QueueItem) -> None:
+        key: str = normalize_card_name(item.name)
+        future: Optional[asyncio.Future[CardData]] = self.in_flight.pop(key, None)
+        self.queued_lanes.pop(key, None)
+        card_info: CardData = card_cache.get(item.name) or CardData(name=item.name, found=False, reason='error')
+        if future is not None and not future.done():
+            future.set_result(card_info)
+        self.task_done(item)
+        event_broker.publish('card', {
+            'query': item.name,
+            'card': card_info.to_dict(),
+            'queue_size': self.get_queue_size(),
+            'cache_size': len(card_cache)
+        })
+
+    def task_done(self, item: QueueItem) -> None:
+        self.queue.task_done()
+        if self.store is not None and item.entry_id:
+            self.store.ack(item.entry_id)
+
+    def enqueue(self, card_name: str, lane: str, client: str, refresh: bool = False) -> None:
+        entry_id: int = self.store.append(card_name, lane, client) if self.store is not None else 0
+        try:
+            self.queue.put_nowait(QueueItem(card_name, lane, client, entry_id, refresh))
+        except asyncio.QueueFull:
+            if entry_id:
+                self.store.ack(entry_id)
+            raise
+
+    def restore(self, entries: List[QueueEntry]) -> int:
+        # Requeue what the store still holds from before a restart, keeping
+        # the entry ids so each one is acknowledged when it is processed
+        restored: int = 0
+        for entry_id, card_name, lane, client in entries:
+            key: str = normalize_card_name(card_name)
+            if lane not in Config.QUEUE_LANES:
+                lane = list(Config.QUEUE_LANES)[-1]
+            queued_lane: Optional[str] = self.queued_lanes.get(key)
+            if key in self.in_flight and (queued_lane is None or lane_rank(lane) >= lane_rank(queued_lane)):
+                self.store.ack(entry_id)
+                continue
+            try:
+                self.queue.put_nowait(QueueItem(card_name, lane, client, entry_id))
+            except asyncio.QueueFull:
+                logger.warning(f"Queue full, leaving {len(entries) - restored} stored entries for the next restart")
+                break
+            if key not in self.in_flight:
+                self.in_flight[key] = asyncio.get_running_loop().create_future()
+            self.queued_lanes[key] = lane
+            restored += 1
+        return restored
+
+    def get_future(self, card_name: str) -> Optional[asyncio.Future[CardData]]:
+        return self.in_flight.get(normalize_card_name(card_name))
+
+    async def add_to_queue(self, card_name: str, lane: str = 'interactive', client: str = '', refresh: bool = False) -> bool:
+        key: str = normalize_card_name(card_name)
+        over_quota: bool = self.queue.client_size(client) >= Config.CLIENT_QUEUE_QUOTA
+        if key in self.in_flight:
+            queued_lane: Optional[str] = self.queued_lanes.get(key)
+            if queued_lane is not None and lane_rank(lane) < lane_rank(queued_lane) and not over_quota:
+                # Let the faster lane overtake the copy already waiting in a slower one
+                try:
+                    self.enqueue(card_name, lane, client)
+                    self.queued_lanes[key] = lane
+                    logger.info(f"Promoted '{card_name}' from the {queued_lane} lane to the {lane} lane")
+                except asyncio.QueueFull:
+                    pass
+            else:
+                logger.info(f"'{card_name}' is already queued, sharing the pending fetch")
             return True
+
+        if over_quota:
+            logger.warning(f"Queue quota reached for {client}, unable to add: {card_name}")
+            return False
+        try:
+            self.enqueue(card_name, lane, client, refresh)
         except asyncio.QueueFull:
             logger.warning(f"Queue full, unable to add: {card_name}")
             return False
-        except asyncio.TimeoutError:
-            logger.warning(f"Timeout while adding to queue: {card_name}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error adding '{card_name}' to queue: {e}")
-            return False
+        self.in_flight[key] = asyncio.get_running_loop().create_future()
+        self.queued_lanes[key] = lane
+        return True
+
+    async def refresh(self, card_name: str) -> bool:
+        return await self.add_to_queue(card_name, Config.REFRESH_LANE, refresh=True)
 
     def get_queue_size(self) -> int:
         return self.queue.qsize()
 
+    def get_worker_states(self) -> List[Dict[str, Any]]:
+        return [dict(state) for state in self.worker_states.values()]
+
+    def get_lane_sizes(self) -> Dict[str, int]:
+        return self.queue.lane_sizes()
+
+    def get_client_count(self) -> int:
+        return self.queue.client_count()
+
 queue_worker: QueueWorker = QueueWorker()
+if Config.QUEUE_STORE_PATH:
+    queue_worker.store = SQLiteQueueStore(
+        Config.QUEUE_STORE_PATH,
+        flush_interval=Config.QUEUE_FLUSH_INTERVAL,
+        compact_interval=Config.QUEUE_COMPACT_INTERVAL
+    )
+
+async def import_bulk_data(source_path: str, index_path: str) -> None:
+    try:
+        count: int = await asyncio.to_thread(build_index, source_path, index_path)
+        logger.info(f"Bulk card index rebuilt with {count} cards")
+    except Exception as e:
+        logger.error(f"Error importing bulk data from {source_path}: {e}")
+
+@app.cli.command('import-bulk')
+@click.argument('source_path')
+def import_bulk_command(source_path: str) -> None:
+    """Build the offline card index from a Scryfall oracle-cards bulk file.
+
+    A running server picks up the new index on its next lookup.
+    """
+    if not Config.BULK_INDEX_PATH:
+        raise click.ClickException("BULK_INDEX_PATH is not configured")
+    count: int = build_index(source_path, Config.BULK_INDEX_PATH)
+    click.echo(f"Imported {count} cards into {Config.BULK_INDEX_PATH}")
 
 # Application lifecycle management
 @app.before_serving
 async def startup() -> None:
     try:
+        if card_cache.store is not None:
+            await card_cache.store.open()
+            warmed: int = await card_cache.warm(Config.L2_WARM_ENTRIES)
+            logger.info(f"Warmed card cache with {warmed} entries from the card store")
+        if Config.BULK_DATA_PATH and Config.BULK_INDEX_PATH and (
+            not os.path.exists(Config.BULK_INDEX_PATH)
+            or os.path.getmtime(Config.BULK_DATA_PATH) > os.path.getmtime(Config.BULK_INDEX_PATH)
+        ):
+            # Serve from the network while the index builds in the background
+            task: asyncio.Task[None] = asyncio.create_task(import_bulk_data(Config.BULK_DATA_PATH, Config.BULK_INDEX_PATH))
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+        if queue_worker.store is not None:
+            await queue_worker.store.open()
+            restored: int = queue_worker.restore(await queue_worker.store.replay())
+            logger.info(f"Restored {restored} queued cards from the queue store")
         await queue_worker.start()
     except Exception as e:
         logger.error(f"Error during startup: {e}")
@@ -248,6 +1446,12 @@ async def startup() -> None:
 async def shutdown() -> None:
     try:
         await queue_worker.stop()
+        if queue_worker.store is not None:
+            await queue_worker.store.close()
+        if card_cache.store is not None:
+            await card_cache.store.close()
+        if bulk_index is not None:
+            bulk_index.close()
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
@@ -288,96 +1492,402 @@ async def fetch_cards() -> ResponseReturnValue:
         card_names: List[str] = data.get('card_names', [])
 
         if not card_names:
+            since: Optional[str] = str(data['since']) if data.get('since') is not None else None
+            if since:
+                try:
+                    card_cache.parse_cursor(since)
+                except ValueError:
+                    return jsonify({'error': 'Invalid since cursor'}), 400
+            etag: str = f"{card_cache.etag()}-{'all' if since is None else f'{zlib.crc32(since.encode()):08x}'}"
+            cached: Optional[Response] = not_modified(etag)
+            if cached is not None:
+                return cached
+            if since is not None:
+                return with_etag(json_response(delta_body(since)), etag), 200
             # If no card names provided, return all cached cards
-            return jsonify([{
-                'name': card.name,
-                'oracle_text': card.oracle_text,
-                'mana_cost': card.mana_cost,
-                'type_line': card.type_line,
-                'set_name': card.set_name,
-                'status': 'found' if card.found else 'not found'
-            } for card in card_cache.values()]), 200
-
-        results: List[Dict[str, Any]] = []
+            return with_etag(json_response(json_array(card.to_json() for card in card_cache.values())), etag), 200
+
+        # Small lookups go ahead of large imports unless the client picks a lane
+        lane: str = data.get('lane') or (
+            'interactive' if len(card_names) <= Config.INTERACTIVE_MAX_CARDS else 'bulk'
+        )
+        if not isinstance(lane, str) or lane not in Config.QUEUE_LANES:
+            return jsonify({'error': f"Unknown lane '{lane}'"}), 400
+
+        # Optionally track the request as a job clients can poll instead of the cache
+        job: Optional[Job] = job_tracker.create(card_names) if data.get('job') else None
+
+        client_id: str = get_client_id()
+        rejected: int = 0
+        results: List[bytes] = []
         for name in card_names:
-            if name in card_cache:
-                card_data: CardData = card_cache[name]
-                results.append({
-                    'name': card_data.name,
-                    'oracle_text': card_data.oracle_text,
-                    'mana_cost': card_data.mana_cost,
-                    'type_line': card_data.type_line,
-                    'set_name': card_data.set_name,
-                    'status': 'found' if card_data.found else 'not found'
-                })
+            card_data: Optional[CardData] = await card_cache.lookup(name)
+            if card_data is not None:
+                if card_cache.is_stale(card_data):
+                    await queue_worker.refresh(name)  # Serve it now, revalidate in the background
+                results.append(card_data.to_json())
+                if job is not None:
+                    job.record(name, card_data)
             else:
-                queued: bool = await queue_worker.add_to_queue(name)
-                results.append({'name': name, 'status': 'queued' if queued else 'queue full'})
+                queued: bool = await queue_worker.add_to_queue(name, lane, client_id)
+                rejected += not queued
+                results.append(dumps_json({'name': name, 'status': 'queued' if queued else 'queue full'}))
+                if job is not None:
+                    future: Optional[asyncio.Future[CardData]] = queue_worker.get_future(name) if queued else None
+                    if future is not None:
+                        job.watch(name, future)
+                    else:
+                        # Either rejected, or already resolved while we were enqueuing
+                        job.record(name, card_cache.get(name) if queued else None)
 
-        return jsonify(results), 200
+        # Names over the client's quota were not queued; the rest of the
+        # results still apply, so they go back with the 503.
+        status_code: int = 503 if rejected else (202 if job is not None else 200)
+        headers: Dict[str, str] = {'Retry-After': str(Config.QUEUE_FULL_RETRY_AFTER)} if rejected else {}
+        if job is not None:
+            return json_response(json_object({'job': job.to_dict()}, results=json_array(results))), status_code, headers
+        body: bytes = json_array(results)
+        if status_code != 200:
+            return json_response(body), status_code, headers
+        # The names still had to be looked up and queued, but an unchanged
+        # answer need not be sent again
+        etag: str = body_etag(body)
+        return not_modified(etag) or with_etag(json_response(body), etag)
     except Exception as e:
         logger.error(f"Error in fetch_cards: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/jobs/<job_id>')
+async def job_status(job_id: str) -> ResponseReturnValue:
+    try:
+        job: Optional[Job] = job_tracker.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        logger.error(f"Error in job_status: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/jobs/<job_id>/results')
+async def job_results(job_id: str) -> ResponseReturnValue:
+    try:
+        job: Optional[Job] = job_tracker.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return json_response(json_object({'job': job.to_dict()}, results=json_array(job.get_results()))), 200
+    except Exception as e:
+        logger.error(f"Error in job_results: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def delta_body(since: Optional[str]) -> bytes:
+    delta: Dict[str, Any] = card_cache.changes_since(since)
+    cards: List[CardData] = delta.pop('cards')
+    return json_object(delta, cards=json_array(card.to_json() for card in cards))
+
+@app.route('/cards/since')
+async def cards_since() -> ResponseReturnValue:
+    try:
+        try:
+            body: bytes = delta_body(request.args.get('since'))
+        except ValueError:
+            return jsonify({'error': 'Invalid since cursor'}), 400
+        return json_response(body), 200
+    except Exception as e:
+        logger.error(f"Error in cards_since: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> str:
+    return base64.b64decode(cursor + '=' * (-len(cursor) % 4), altchars=b'-_', validate=True).decode()
+
+def card_filter(args: Any) -> Optional[Callable[[CardData], bool]]:
+    # set_name matches exactly and type_line by substring, both ignoring case
+    found: Optional[str] = args.get('found')
+    set_name: Optional[str] = args.get('set_name')
+    type_line: Optional[str] = args.get('type_line')
+    if found is None and set_name is None and type_line is None:
+        return None
+    if found is not None and found.lower() not in ('true', 'false', '1', '0'):
+        raise ValueError(f"Invalid found value '{found}'")
+    want_found: Optional[bool] = None if found is None else found.lower() in ('true', '1')
+    set_name = set_name.casefold() if set_name is not None else None
+    type_line = type_line.casefold() if type_line is not None else None
+
+    def matches(card_info: CardData) -> bool:
+        return ((want_found is None or card_info.found == want_found)
+                and (set_name is None or card_info.set_name.casefold() == set_name)
+                and (type_line is None or type_line in card_info.type_line.casefold()))
+    return matches
+
+@app.route('/cards')
+async def list_cards() -> ResponseReturnValue:
+    try:
+        limit: int = request.args.get('limit', default=Config.CARDS_PAGE_SIZE, type=int)
+        if limit < 1:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+        limit = min(limit, Config.CARDS_MAX_PAGE_SIZE)
+
+        fields: Optional[List[str]] = None
+        if request.args.get('fields'):
+            fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+            unknown: List[str] = [field for field in fields if field not in CardData.FIELDS]
+            if unknown:
+                return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+
+        try:
+            after: Optional[str] = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        try:
+            predicate: Optional[Callable[[CardData], bool]] = card_filter(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        etag: str = f"{card_cache.etag()}-{zlib.crc32(request.query_string):08x}"
+        cached: Optional[Response] = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        cards, last = card_cache.page(after, limit, predicate)
+        # Full cards reuse their memoized JSON; projections only read the fields asked for
+        body: bytes = json_object(
+            {'next': encode_cursor(last) if last is not None else None, 'since': card_cache.cursor()},
+            cards=json_array(card.to_json() if fields is None else dumps_json(card.to_dict(fields)) for card in cards)
+        )
+        return with_etag(json_response(body), etag)
+    except Exception as e:
+        logger.error(f"Error in list_cards: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+class Exporter(ABC):
+    media_type: str = 'text/plain'
+    extension: str = 'txt'
+    # Decklists list each card once with a count; other formats keep one row per requested name
+    merge_duplicates: bool = False
+
+    def begin(self, out: StringIO) -> None:
+        pass
+
+    @abstractmethod
+    def write(self, out: StringIO, query: str, card_data: Optional[CardData], count: int) -> None:
+        ...
+
+class CSVExporter(Exporter):
+    media_type = 'text/csv'
+    extension = 'csv'
+
+    def begin(self, out: StringIO) -> None:
+        csv.writer(out).writerow(['Name', 'Oracle Text', 'Mana Cost', 'Type Line', 'Set Name', 'Status'])
+
+    def write(self, out: StringIO, query: str, card_data: Optional[CardData], count: int) -> None:
+        if card_data:
+            csv.writer(out).writerow([
+                card_data.name,
+                card_data.oracle_text,
+                card_data.mana_cost,
+                card_data.type_line,
+                card_data.set_name,
+                card_data.status
+            ])
+        else:
+            csv.writer(out).writerow([query, '', '', '', '', 'not found'])
+
+class JSONLinesExporter(Exporter):
+    media_type = 'application/x-ndjson'
+    extension = 'jsonl'
+
+    def write(self, out: StringIO, query: str, card_data: Optional[CardData], count: int) -> None:
+        out.write((card_data.to_json() if card_data else dumps_json({'name': query, 'status': 'not found'})).decode())
+        out.write('\n')
+
+class MTGOExporter(Exporter):
+    # "4 Lightning Bolt"; names that were not found are kept as entered
+    merge_duplicates = True
+
+    def write(self, out: StringIO, query: str, card_data: Optional[CardData], count: int) -> None:
+        out.write(f"{count} {card_data.name if card_data and card_data.found else query}\n")
+
+class ArenaExporter(MTGOExporter):
+    # "4 Lightning Bolt (LEA) 161", pinning the printing when it is known
+    def write(self, out: StringIO, query: str, card_data: Optional[CardData], count: int) -> None:
+        if card_data and card_data.found and card_data.set_code:
+            out.write(f"{count} {card_data.name} ({card_data.set_code.upper()}) {card_data.collector_number}\n")
+        else:
+            super().write(out, query, card_data, count)
+
+# Selected by format=, or else by Accept; the first one is the default
+exporters: Dict[str, Exporter] = {
+    'csv': CSVExporter(),
+    'jsonl': JSONLinesExporter(),
+    'arena': ArenaExporter(),
+    'mtgo': MTGOExporter()
+}
+
+# Each entry makes a fresh streaming compressor with compress() and flush()
+compressors: Dict[str, Callable[[], Any]] = {'gzip': partial(zlib.compressobj, wbits=31)}  # wbits=31 writes a gzip header
+if zstandard is not None:
+    compressors['zstd'] = lambda: zstandard.ZstdCompressor().compressobj()
+compressed_files: Dict[str, Tuple[str, str]] = {'gzip': ('application/gzip', 'gz'), 'zstd': ('application/zstd', 'zst')}
+
+def choose_exporter(data: Dict[str, Any]) -> Optional[str]:
+    export_format: Optional[str] = data.get('format') or request.args.get('format')
+    if export_format:
+        return export_format if isinstance(export_format, str) and export_format in exporters else None
+    by_media_type: Dict[str, str] = {}
+    for name, exporter in exporters.items():
+        by_media_type.setdefault(exporter.media_type, name)
+    best: Optional[str] = request.accept_mimetypes.best_match(list(by_media_type))
+    return by_media_type[best] if best else next(iter(exporters))
+
 @app.route('/export', methods=['POST'])
 async def export_cards() -> ResponseReturnValue:
     try:
         data: Dict[str, Any] = await request.get_json()
-        card_names: List[str] = data.get('card_names', [])
+        requested: List[str] = data.get('card_names', [])
+        card_names: List[str] = requested or list(card_cache.keys())
 
-        if not card_names:
-            card_names = list(card_cache.keys())
+        export_format: Optional[str] = choose_exporter(data)
+        if export_format is None:
+            return jsonify({'error': f"Unknown format, expected one of {', '.join(exporters)}"}), 400
+        exporter: Exporter = exporters[export_format]
+        filename: str = f"card_data.{exporter.extension}"
+        mimetype: str = exporter.media_type
 
-        output = StringIO()
-        writer = csv.writer(output)
+        # An explicit compression produces a compressed file; otherwise the
+        # transfer itself is compressed if the client allows it
+        compression: Optional[str] = data.get('compression') or request.args.get('compression')
+        content_encoding: Optional[str] = None
+        if compression:
+            if not isinstance(compression, str) or compression not in compressors:
+                return jsonify({'error': f"Unsupported compression, expected one of {', '.join(compressors)}"}), 400
+            mimetype, extension = compressed_files[compression]
+            filename = f"{filename}.{extension}"
+        elif Config.EXPORT_COMPRESSION:
+            # Highest quality wins, zstd on a tie; q=0 refuses an encoding
+            content_encoding = request.accept_encodings.best_match(
+                [encoding for encoding in ('zstd', 'gzip') if encoding in compressors]
+            )
+        encoding: Optional[str] = compression or content_encoding
 
-        # Write header
-        writer.writerow(['Name', 'Oracle Text', 'Mana Cost', 'Type Line', 'Set Name', 'Status'])
+        # The version covers found and negative entries alike, including
+        # negative entries expiring, so a 304 never keeps a stale status.
+        # Lookups through the card store can still promote cards during the
+        # export; that only bumps the version and costs one extra full response
+        etag: str = f"{card_cache.etag()}-{zlib.crc32(json.dumps([requested, export_format, encoding]).encode()):08x}"
+        cached: Optional[Response] = not_modified(etag)
+        if cached is not None:
+            return cached
 
-        for name in card_names:
-            card_data: Optional[CardData] = card_cache.get(name)
-            if card_data:
-                writer.writerow([
-                    card_data.name,
-                    card_data.oracle_text,
-                    card_data.mana_cost,
-                    card_data.type_line,
-                    card_data.set_name,
-                    'found' if card_data.found else 'not found'
-                ])
-            else:
-                writer.writerow([name, '', '', '', '', 'not found'])
-
-        output.seek(0)
-        bytes_io = BytesIO(output.getvalue().encode())
-        return await send_file(
-            bytes_io,
-            mimetype='text/csv',
-            as_attachment=True,
-            attachment_filename='card_data.csv'
+        response: Response = Response(
+            export_rows(card_names, exporter, compressors[encoding]() if encoding else None),
+            mimetype=mimetype
         )
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        response.headers['Vary'] = 'Accept, Accept-Encoding'
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+        response.timeout = None  # Large exports may take longer than a normal request
+        return with_etag(response, etag)
     except Exception as e:
         logger.error(f"Error in export_cards: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+async def export_rows(card_names: List[str], exporter: Exporter, compressor: Optional[Any]):
+    # Every format goes through this one pass over the cache. Rows are written
+    # into a small buffer that is flushed every EXPORT_CHUNK_SIZE characters,
+    # so memory stays flat however many cards are exported.
+    buffer = StringIO()
+
+    def flush() -> bytes:
+        chunk: bytes = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(chunk) if compressor is not None else chunk
+
+    # For decklists, repeated names and spellings known to resolve to the
+    # same card become one entry with a count
+    entries: List[Tuple[str, int]] = [(name, 1) for name in card_names]
+    if exporter.merge_duplicates:
+        counts: Dict[str, int] = {}
+        queries: Dict[str, str] = {}
+        for name in card_names:
+            key: str = card_cache.resolve_key(name)
+            counts[key] = counts.get(key, 0) + 1
+            queries.setdefault(key, name)
+        entries = [(name, counts[key]) for key, name in queries.items()]
+
+    exporter.begin(buffer)
+    try:
+        for name, count in entries:
+            exporter.write(buffer, name, await card_cache.lookup(name), count)
+            if buffer.tell() >= Config.EXPORT_CHUNK_SIZE:
+                chunk: bytes = flush()
+                if chunk:
+                    yield chunk
+    except Exception as e:
+        # Headers are already sent; re-raising aborts the chunked response
+        # without a final chunk or compressor trailer, so the client sees a
+        # failed download rather than a short file that looks complete
+        logger.error(f"Error streaming export: {e}")
+        raise
+    chunk = flush()
+    if compressor is not None:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
 @app.route('/status')
 async def status() -> ResponseReturnValue:
     try:
-        return jsonify({
+        body: bytes = dumps_json({
             'queue_size': queue_worker.get_queue_size(),
             'cache_size': len(card_cache),
-            'is_fetching': queue_worker.is_running
-        }), 200
+            'is_fetching': queue_worker.is_running,
+            'lanes': queue_worker.get_lane_sizes(),
+            'queued_clients': queue_worker.get_client_count(),
+            'workers': queue_worker.get_worker_states(),
+            'upstream': upstream_pacer.get_state()
+        })
+        etag: str = body_etag(body)
+        return not_modified(etag) or with_etag(json_response(body), etag)
     except Exception as e:
         logger.error(f"Error in status: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/events')
+async def events() -> ResponseReturnValue:
+    subscriber: asyncio.Queue[Optional[str]] = event_broker.subscribe()
+
+    async def stream():
+        try:
+            yield f"event: status\ndata: {json.dumps({'queue_size': queue_worker.get_queue_size(), 'cache_size': len(card_cache)})}\n\n"
+            while True:
+                try:
+                    message: Optional[str] = await asyncio.wait_for(subscriber.get(), timeout=Config.SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    response: Response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.timeout = None  # The stream stays open for the lifetime of the page
+    return response
+
 @app.route('/clear', methods=['POST'])
 async def clear_cards() -> ResponseReturnValue:
     try:
         card_cache.clear()
-        await queue_worker.stop()
+        await queue_worker.stop(drain=False)
         await queue_worker.start()
+        event_broker.publish('clear', {'queue_size': queue_worker.get_queue_size(), 'cache_size': len(card_cache)})
         return jsonify({'success': True, 'message': 'All cards cleared'}), 200
     except Exception as e:
         logger.error(f"Error in clear_cards: {e}")
@@ -0,0 +1,61 @@
+import random
+import sys
+from typing import Iterator, List, Tuple
+
+from cachetools import TTLCache
+
+from card_store import normalize_card_name
+from tinylfu import WTinyLFUCache
+
+# Run from the repository root: python -m benchmarks.bench_cache_policy [trace.txt]
+#
+# A trace is a text file with one requested card name per line, for example
+# the names from /fetch requests pulled out of the access logs. Without one, a
+# synthetic trace is used: Zipf-distributed lookups of popular cards with a
+# bulk export of rare, never repeated cards every few thousand requests.
+
+TTL: float = 1e9  # Only capacity matters here
+
+def synthetic_trace(requests: int = 200000, popular: int = 5000, scan_every: int = 5000,
+                    scan_length: int = 2000, seed: int = 1) -> List[str]:
+    rng: random.Random = random.Random(seed)
+    weights: List[float] = [1 / (rank + 1) for rank in range(popular)]
+    names: List[str] = []
+    scans: int = 0
+    while len(names) < requests:
+        names.extend(f"popular {rank}" for rank in rng.choices(range(popular), weights, k=scan_every))
+        names.extend(f"rare {scans} {i}" for i in range(scan_length))
+        scans += 1
+    return names[:requests]
+
+def load_trace(path: str) -> List[str]:
+    with open(path, encoding='utf-8') as fp:
+        return [normalize_card_name(line) for line in fp if line.strip()]
+
+def replay(cache: object, trace: List[str]) -> Tuple[int, int]:
+    get = cache.get  # type: ignore[attr-defined]
+    hits: int = 0
+    for key in trace:
+        if get(key) is not None:
+            hits += 1
+        else:
+            cache[key] = True  # type: ignore[index]
+    return hits, len(trace)
+
+def policies(maxsize: int) -> Iterator[Tuple[str, object]]:
+    yield 'ttl', TTLCache(maxsize=maxsize, ttl=TTL)
+    yield 'tinylfu', WTinyLFUCache(maxsize, TTL)
+
+def main() -> None:
+    trace: List[str] = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    print(f"{len(trace)} requests, {len(set(trace))} distinct names")
+    print(f"{'size':>8} {'ttl hit rate':>14} {'tinylfu hit rate':>18}")
+    for maxsize in (250, 500, 1000, 2000, 4000):
+        rates: List[float] = []
+        for _, cache in policies(maxsize):
+            hits, total = replay(cache, trace)
+            rates.append(hits / total)
+        print(f"{maxsize:>8} {rates[0]:>14.1%} {rates[1]:>18.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import time
+from typing import List
+
+from app import RateLimiter
+
+# Run from the repository root: python -m benchmarks.bench_rate_limiter
+
+class ListRateLimiter:
+    # The previous implementation, kept here as the baseline
+    def __init__(self, limit: int, period: int):
+        self.limit: int = limit
+        self.period: int = period
+        self.requests: List[float] = []
+
+    def is_allowed(self) -> bool:
+        now: float = time.time()
+        self.requests = [t for t in self.requests if now - t < self.period]
+        if len(self.requests) < self.limit:
+            self.requests.append(now)
+            return True
+        return False
+
+def per_call_ns(limiter: object, calls: int) -> float:
+    is_allowed = limiter.is_allowed  # type: ignore[attr-defined]
+    start: int = time.perf_counter_ns()
+    for _ in range(calls):
+        is_allowed()
+    return (time.perf_counter_ns() - start) / calls
+
+def main() -> None:
+    calls: int = 20000
+    print(f"{'limit':>8} {'list (ns/call)':>16} {'gcra (ns/call)':>16}")
+    for limit in (10, 100, 1000, 10000, 100000):
+        # A long window keeps the list limiter saturated, its worst case
+        list_ns: float = per_call_ns(ListRateLimiter(limit, 3600), min(calls, 2000))
+        gcra_ns: float = per_call_ns(RateLimiter(limit, 3600), calls)
+        print(f"{limit:>8} {list_ns:>16.0f} {gcra_ns:>16.0f}")
+
+if __name__ == '__main__':
+    main()
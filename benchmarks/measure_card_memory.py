@@ -0,0 +1,97 @@
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from app import CardData, Config
+from bulk_index import iter_json_array
+
+# Run from the repository root: python -m benchmarks.measure_card_memory [oracle-cards.json]
+#
+# Reports the memory each cached card costs, measured with tracemalloc while
+# parsing card payloads the way API responses arrive and serving each card
+# once, so memoized JSON is counted. Pass a Scryfall
+# oracle-cards bulk file to measure real cards; otherwise synthetic cards
+# with similar field lengths are used.
+
+class DictCardData:
+    # The previous implementation, kept here as the baseline; it serialized on every request
+    def __init__(self, name: str, oracle_text: str = '', mana_cost: str = '', type_line: str = '', set_name: str = '', found: bool = True,
+                 fetched_at: float = 0.0, reason: Any = None):
+        self.name: str = name
+        self.oracle_text: str = oracle_text
+        self.mana_cost: str = mana_cost
+        self.type_line: str = type_line
+        self.set_name: str = set_name
+        self.found: bool = found
+        self.fetched_at: float = fetched_at or time.time()
+        self.reason: Any = reason
+
+    def to_json(self) -> bytes:
+        return json.dumps(vars(self)).encode()
+
+WORDS: List[str] = (
+    "target creature player you control gets until end of turn draw a card each opponent "
+    "deals damage to any flying trample whenever enters the battlefield sacrifice destroy "
+    "exile return from your graveyard to hand counter spell mana of any color tap untap"
+).split()
+
+def synthetic_payloads(count: int, seed: int = 1) -> List[str]:
+    rng: random.Random = random.Random(seed)
+    sets: List[str] = [f"Set Number {i}" for i in range(300)]
+    types: List[str] = [f"Creature — Type {i}" for i in range(400)] + ["Instant", "Sorcery", "Artifact", "Enchantment"]
+    costs: List[str] = [f"{{{i % 8}}}{'{W}' * (i % 3)}{'{U}' * (i % 2)}" for i in range(200)]
+    return [
+        json.dumps({
+            'name': f"Card Number {i}",
+            'oracle_text': ' '.join(rng.choices(WORDS, k=rng.randint(10, 90))).capitalize() + '.',
+            'mana_cost': rng.choice(costs),
+            'type_line': rng.choice(types),
+            'set_name': rng.choice(sets)
+        })
+        for i in range(count)
+    ]
+
+def bulk_payloads(path: str) -> List[str]:
+    with open(path, encoding='utf-8') as fp:
+        return [json.dumps(card) for card in iter_json_array(fp) if card.get('name')]
+
+def bytes_per_card(payloads: List[str], build: Callable[[Dict[str, Any]], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start: int = tracemalloc.get_traced_memory()[0]
+    cards: List[Any] = [build(json.loads(payload)) for payload in payloads]
+    for card in cards:
+        card.to_json()
+    gc.collect()
+    used: int = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del cards
+    return used / len(payloads)
+
+def from_api(data: Dict[str, Any]) -> DictCardData:
+    return DictCardData(data.get('name', ''), data.get('oracle_text', ''), data.get('mana_cost', ''),
+                        data.get('type_line', ''), data.get('set_name', ''), True)
+
+def main() -> None:
+    payloads: List[str] = bulk_payloads(sys.argv[1]) if len(sys.argv) > 1 else synthetic_payloads(30000)
+    print(f"{len(payloads)} cards")
+    baseline: float = bytes_per_card(payloads, from_api)
+    Config.COMPRESS_ORACLE_TEXT = False
+    Config.MEMOIZE_CARD_JSON = False
+    compact: float = bytes_per_card(payloads, CardData.from_api)
+    Config.MEMOIZE_CARD_JSON = True
+    memoized: float = bytes_per_card(payloads, CardData.from_api)
+    Config.COMPRESS_ORACLE_TEXT = True
+    compressed: float = bytes_per_card(payloads, CardData.from_api)
+    print(f"{'representation':<32} {'bytes/card':>10}")
+    print(f"{'__dict__ (before)':<32} {baseline:>10.0f}")
+    print(f"{'__slots__ + interning':<32} {compact:>10.0f}")
+    print(f"{'... + memoized JSON':<32} {memoized:>10.0f}")
+    print(f"{'__slots__ + zlib oracle text':<32} {compressed:>10.0f}")
+
+if __name__ == '__main__':
+    main()
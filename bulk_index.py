@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from card_store import CardRow, normalize_card_name
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the table layout changes; older indexes are ignored until re-imported
+INDEX_VERSION: int = 2
+
+# (name, oracle_text, mana_cost, type_line, set_name, set_code, collector_number)
+IndexRow = Tuple[str, str, str, str, str, str, str]
+
+def iter_json_array(fp: TextIO, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    # Scryfall bulk files are a single JSON array of objects, so decode one
+    # element at a time from a sliding buffer instead of loading the whole file.
+    decoder: json.JSONDecoder = json.JSONDecoder()
+    buffer: str = fp.read(chunk_size).lstrip()
+    while not buffer:
+        chunk: str = fp.read(chunk_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith('['):
+        raise ValueError("Bulk data file is not a JSON array")
+    pos: int = 1
+    eof: bool = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        if isinstance(item, dict):
+            yield item
+        pos = end
+
+def card_row(card: Dict[str, Any]) -> CardRow:
+    return (
+        card.get('name', ''),
+        card.get('oracle_text', ''),
+        card.get('mana_cost', ''),
+        card.get('type_line', ''),
+        card.get('set_name', ''),
+        True,
+        card.get('set', ''),
+        card.get('collector_number', '')
+    )
+
+def index_row(row: CardRow) -> IndexRow:
+    return (row[0], row[1], row[2], row[3], row[4], row[6], row[7])
+
+def write_rows(conn: sqlite3.Connection, cards: Dict[str, IndexRow], faces: Dict[str, IndexRow]) -> None:
+    conn.executemany("INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     [(key, *values) for key, values in cards.items()])
+    conn.executemany("INSERT OR IGNORE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     [(key, *values) for key, values in faces.items()])
+    cards.clear()
+    faces.clear()
+
+def build_index(source_path: str, index_path: str, batch_size: int = 5000) -> int:
+    # Build next to the live index and swap it in with a single rename, so
+    # readers only ever see the old or the new file, never a partial one.
+    tmp_path: str = f"{index_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn: sqlite3.Connection = sqlite3.connect(tmp_path)
+    count: int = 0
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("""
+            CREATE TABLE cards (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                oracle_text TEXT NOT NULL,
+                mana_cost TEXT NOT NULL,
+                type_line TEXT NOT NULL,
+                set_name TEXT NOT NULL,
+                set_code TEXT NOT NULL,
+                collector_number TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"PRAGMA user_version={INDEX_VERSION}")
+        cards: Dict[str, IndexRow] = {}
+        faces: Dict[str, IndexRow] = {}
+        with open(source_path, encoding='utf-8') as fp:
+            for card in iter_json_array(fp):
+                if card.get('object') not in (None, 'card'):
+                    continue
+                row: IndexRow = index_row(card_row(card))
+                full_name: str = row[0]
+                if not full_name:
+                    continue
+                cards[normalize_card_name(full_name)] = row
+                # Single faces of split, adventure and double-faced cards never
+                # override a card whose full name matches
+                for face_name in full_name.split(' // '):
+                    faces.setdefault(normalize_card_name(face_name), row)
+                count += 1
+                if len(cards) + len(faces) >= batch_size:
+                    write_rows(conn, cards, faces)
+        write_rows(conn, cards, faces)
+        conn.commit()
+        conn.execute("VACUUM")
+    except Exception:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+
+    os.replace(tmp_path, index_path)
+    logger.info(f"Imported {count} cards from {source_path} into {index_path}")
+    return count
+
+class BulkCardIndex:
+    def __init__(self, path: str, reload_interval: float = 5.0):
+        self.path: str = path
+        self.reload_interval: float = reload_interval
+        self.conn: Optional[sqlite3.Connection] = None
+        self.identity: Optional[Tuple[int, int]] = None
+        self.checked_at: float = float('-inf')
+        self.lock: threading.Lock = threading.Lock()
+
+    def lookup(self, card_name: str) -> Optional[CardRow]:
+        conn: Optional[sqlite3.Connection] = self.connection()
+        if conn is None:
+            return None
+        with self.lock:
+            row = conn.execute(
+                "SELECT name, oracle_text, mana_cost, type_line, set_name, set_code, collector_number "
+                "FROM cards WHERE key = ?",
+                (normalize_card_name(card_name),)
+            ).fetchone()
+        if row is None:
+            return None
+        return (row[0], row[1], row[2], row[3], row[4], True, row[5], row[6])
+
+    def connection(self) -> Optional[sqlite3.Connection]:
+        # A re-import replaces the file, so reopen whenever its identity changes
+        now: float = time.monotonic()
+        if now - self.checked_at < self.reload_interval:
+            return self.conn
+        self.checked_at = now
+        try:
+            stat: os.stat_result = os.stat(self.path)
+        except FileNotFoundError:
+            return self.conn
+        identity: Tuple[int, int] = (stat.st_ino, stat.st_mtime_ns)
+        if identity != self.identity:
+            self.reload(identity)
+        return self.conn
+
+    def reload(self, identity: Tuple[int, int]) -> None:
+        try:
+            conn: sqlite3.Connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            version: int = conn.execute("PRAGMA user_version").fetchone()[0]
+            count: int = conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Error opening bulk card index {self.path}: {e}")
+            return
+        if version != INDEX_VERSION:
+            conn.close()
+            # Remember the identity anyway so the warning is not repeated on every lookup
+            self.identity = identity
+            logger.warning(f"Bulk card index {self.path} has an old layout, re-run import-bulk to use it")
+            return
+        with self.lock:
+            old, self.conn, self.identity = self.conn, conn, identity
+        if old is not None:
+            old.close()
+        logger.info(f"Loaded bulk card index {self.path} with {count} entries")
+
+    def close(self) -> None:
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+                self.identity = None
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (name, oracle_text, mana_cost, type_line, set_name, found, set_code, collector_number)
+CardRow = Tuple[str, str, str, str, str, bool, str, str]
+
+def normalize_card_name(name: str) -> str:
+    return ' '.join(name.split()).casefold()
+
+class SQLiteCardStore:
+    SCHEMA_VERSION: int = 3
+
+    def __init__(self, path: str, ttl: int, flush_interval: float = 1.0, flush_batch_size: int = 500,
+                 purge_interval: float = 3600.0):
+        self.path: str = path
+        self.ttl: int = ttl
+        self.flush_interval: float = flush_interval
+        self.flush_batch_size: int = flush_batch_size
+        self.purge_interval: float = purge_interval
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock: threading.Lock = threading.Lock()
+        # Write-behind buffers, drained by the flusher task in a worker thread
+        self.pending_rows: Dict[str, Tuple[CardRow, float]] = {}  # key -> (row, fetched_at)
+        self.pending_aliases: Dict[str, str] = {}
+        self.pending_hits: Dict[str, int] = {}
+        self.flush_needed: asyncio.Event = asyncio.Event()
+        self.flusher_task: Optional[asyncio.Task[None]] = None
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+        self.flusher_task = asyncio.create_task(self.run_flusher())
+        logger.info(f"Card store opened at {self.path}")
+
+    async def close(self) -> None:
+        if self.flusher_task:
+            self.flusher_task.cancel()
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+            self.flusher_task = None
+        await self.flush()
+        await asyncio.to_thread(self._close)
+        logger.info("Card store closed")
+
+    async def get(self, key: str) -> Optional[Tuple[str, CardRow, float]]:
+        return await asyncio.to_thread(self._get, key, time.time())
+
+    def record_hit(self, key: str) -> None:
+        # Counted by the caller for client reads from either tier, written with the next flush
+        self.pending_hits[key] = self.pending_hits.get(key, 0) + 1
+
+    def put(self, key: str, aliases: List[str], row: CardRow, fetched_at: float) -> None:
+        self.pending_rows[key] = (row, fetched_at)
+        for alias in aliases:
+            self.pending_aliases[alias] = key
+        if len(self.pending_rows) >= self.flush_batch_size:
+            self.flush_needed.set()
+
+    async def hottest(self, limit: int) -> List[Tuple[str, CardRow, float, List[str]]]:
+        return await asyncio.to_thread(self._hottest, limit, time.time())
+
+    async def flush(self) -> None:
+        if not (self.pending_rows or self.pending_aliases or self.pending_hits):
+            return
+        rows, self.pending_rows = self.pending_rows, {}
+        aliases, self.pending_aliases = self.pending_aliases, {}
+        hits, self.pending_hits = self.pending_hits, {}
+        await asyncio.to_thread(self._write, rows, aliases, hits)
+
+    async def run_flusher(self) -> None:
+        last_purge: float = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_needed.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_needed.clear()
+            try:
+                await self.flush()
+                if time.monotonic() - last_purge >= self.purge_interval:
+                    last_purge = time.monotonic()
+                    purged: int = await asyncio.to_thread(self._purge, time.time())
+                    logger.info(f"Purged {purged} expired entries from card store")
+            except Exception as e:
+                logger.error(f"Error flushing card store: {e}")
+
+    def _open(self) -> None:
+        conn: sqlite3.Connection = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version: int = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            # The store is only a cache, so an old layout is simply dropped
+            conn.executescript("DROP TABLE IF EXISTS cards; DROP TABLE IF EXISTS aliases;")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cards (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                oracle_text TEXT NOT NULL,
+                mana_cost TEXT NOT NULL,
+                type_line TEXT NOT NULL,
+                set_name TEXT NOT NULL,
+                found INTEGER NOT NULL,
+                set_code TEXT NOT NULL,
+                collector_number TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS cards_hits ON cards (hits);
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS aliases_key ON aliases (key);
+        """)
+        conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        conn.commit()
+        self.conn = conn
+
+    def _close(self) -> None:
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def _get(self, key: str, now: float) -> Optional[Tuple[str, CardRow, float]]:
+        with self.lock:
+            if self.conn is None:
+                return None
+            row = self.conn.execute(
+                "SELECT key, name, oracle_text, mana_cost, type_line, set_name, found, set_code, collector_number, "
+                "fetched_at FROM cards WHERE key = COALESCE((SELECT key FROM aliases WHERE alias = ?), ?) AND expires_at > ?",
+                (key, key, now)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], (row[1], row[2], row[3], row[4], row[5], bool(row[6]), row[7], row[8]), row[9]
+
+    def _write(self, rows: Dict[str, Tuple[CardRow, float]], aliases: Dict[str, str], hits: Dict[str, int]) -> None:
+        with self.lock:
+            if self.conn is None:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO cards (key, name, oracle_text, mana_cost, type_line, set_name, found, set_code, "
+                    "collector_number, fetched_at, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET name = excluded.name, oracle_text = excluded.oracle_text, "
+                    "mana_cost = excluded.mana_cost, type_line = excluded.type_line, set_name = excluded.set_name, "
+                    "found = excluded.found, set_code = excluded.set_code, collector_number = excluded.collector_number, "
+                    "fetched_at = excluded.fetched_at, expires_at = excluded.expires_at",
+                    [(key, *row[:5], int(row[5]), row[6], row[7], fetched_at, fetched_at + self.ttl)
+                     for key, (row, fetched_at) in rows.items()]
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO aliases (alias, key) VALUES (?, ?)",
+                    list(aliases.items())
+                )
+                self.conn.executemany(
+                    "UPDATE cards SET hits = hits + ? WHERE key = ?",
+                    [(count, key) for key, count in hits.items()]
+                )
+
+    def _hottest(self, limit: int, now: float) -> List[Tuple[str, CardRow, float, List[str]]]:
+        with self.lock:
+            if self.conn is None:
+                return []
+            # Aliases are joined to the selected rows, so ties in hits cannot
+            # make the two sides pick different cards
+            rows = self.conn.execute(
+                "WITH hot AS (SELECT key, name, oracle_text, mana_cost, type_line, set_name, found, set_code, "
+                "collector_number, fetched_at, hits FROM cards WHERE expires_at > ? ORDER BY hits DESC, key LIMIT ?) "
+                "SELECT hot.*, aliases.alias FROM hot LEFT JOIN aliases ON aliases.key = hot.key "
+                "ORDER BY hot.hits DESC, hot.key",
+                (now, limit)
+            ).fetchall()
+        entries: Dict[str, Tuple[str, CardRow, float, List[str]]] = {}
+        for row in rows:
+            if row[0] not in entries:
+                entries[row[0]] = (row[0], (row[1], row[2], row[3], row[4], row[5], bool(row[6]), row[7], row[8]), row[9], [])
+            if row[11] is not None:
+                entries[row[0]][3].append(row[11])
+        return list(entries.values())
+
+    def _purge(self, now: float) -> int:
+        with self.lock:
+            if self.conn is None:
+                return 0
+            with self.conn:
+                purged: int = self.conn.execute("DELETE FROM cards WHERE expires_at <= ?", (now,)).rowcount
+                self.conn.execute("DELETE FROM aliases WHERE key NOT IN (SELECT key FROM cards)")
+            return purged
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (entry_id, name, lane, client)
+QueueEntry = Tuple[int, str, str, str]
+
+class SQLiteQueueStore:
+    def __init__(self, path: str, flush_interval: float = 0.5, compact_interval: float = 600.0):
+        self.path: str = path
+        self.flush_interval: float = flush_interval
+        self.compact_interval: float = compact_interval
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock: threading.Lock = threading.Lock()
+        self.next_id: int = 1
+        # Write-behind buffers; an entry acknowledged before it is flushed never touches the disk
+        self.pending_entries: Dict[int, Tuple[str, str, str]] = {}
+        self.pending_acks: Set[int] = set()
+        self.flusher_task: Optional[asyncio.Task[None]] = None
+
+    async def open(self) -> None:
+        last_id: int = await asyncio.to_thread(self._open)
+        self.next_id = max(self.next_id, last_id + 1)
+        self.flusher_task = asyncio.create_task(self.run_flusher())
+        logger.info(f"Queue store opened at {self.path}")
+
+    async def close(self) -> None:
+        if self.flusher_task:
+            self.flusher_task.cancel()
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+            self.flusher_task = None
+        await self.flush()
+        await asyncio.to_thread(self._close)
+        logger.info("Queue store closed")
+
+    def append(self, name: str, lane: str, client: str) -> int:
+        entry_id: int = self.next_id
+        self.next_id += 1
+        self.pending_entries[entry_id] = (name, lane, client)
+        return entry_id
+
+    def ack(self, entry_id: int) -> None:
+        if self.pending_entries.pop(entry_id, None) is None:
+            self.pending_acks.add(entry_id)
+
+    async def replay(self) -> List[QueueEntry]:
+        await self.flush()
+        return await asyncio.to_thread(self._load)
+
+    async def flush(self) -> None:
+        if not (self.pending_entries or self.pending_acks):
+            return
+        entries, self.pending_entries = self.pending_entries, {}
+        acks, self.pending_acks = self.pending_acks, set()
+        await asyncio.to_thread(self._write, entries, acks)
+
+    async def run_flusher(self) -> None:
+        last_compact: float = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.monotonic() - last_compact >= self.compact_interval:
+                    last_compact = time.monotonic()
+                    if await asyncio.to_thread(self._compact):
+                        logger.info("Compacted queue store")
+            except Exception as e:
+                logger.error(f"Error flushing queue store: {e}")
+
+    def _open(self) -> int:
+        conn: sqlite3.Connection = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                lane TEXT NOT NULL,
+                client TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        self.conn = conn
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+
+    def _close(self) -> None:
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def _load(self) -> List[QueueEntry]:
+        with self.lock:
+            if self.conn is None:
+                return []
+            return self.conn.execute("SELECT id, name, lane, client FROM entries ORDER BY id").fetchall()
+
+    def _write(self, entries: Dict[int, Tuple[str, str, str]], acks: Set[int]) -> None:
+        with self.lock:
+            if self.conn is None:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO entries (id, name, lane, client) VALUES (?, ?, ?, ?)",
+                    [(entry_id, *entry) for entry_id, entry in entries.items()]
+                )
+                self.conn.executemany("DELETE FROM entries WHERE id = ?", [(entry_id,) for entry_id in acks])
+
+    def _compact(self) -> bool:
+        # Acknowledged entries leave free pages behind; rewrite the file once
+        # they make up most of it, and keep the WAL from growing meanwhile.
+        with self.lock:
+            if self.conn is None:
+                return False
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            free_pages: int = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            pages: int = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            if free_pages * 2 < pages:
+                return False
+            self.conn.execute("VACUUM")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return True
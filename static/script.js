@@ -24,6 +24,18 @@ document.addEventListener('DOMContentLoaded', function() {
     let totalCards = 0;
     let fetchedCards = 0;
 
+    // Rendered card elements keyed by normalized name, so updates replace them in place
+    const cardElements = new Map();
+    // Queued names still waiting for a result, normalized name -> name as entered
+    const pendingNames = new Map();
+    // Results that arrived while a /fetch request was still in flight
+    const earlyResults = new Map();
+    // Cache version this page has caught up to
+    let cursor = '';
+    let retryTimer = null;
+    // Last response per request body, revalidated with If-None-Match
+    const etags = new Map();
+
     // Utility Functions
     function displayMessage(message, type) {
         const messageElement = document.createElement('div');
@@ -46,12 +58,90 @@ document.addEventListener('DOMContentLoaded', function() {
         } else {
             progressContainer.style.display = 'none';
             fetchButton.disabled = false;
-            exportButton.disabled = fetchedCards === 0;
-            clearButton.disabled = fetchedCards === 0;
-            if (fetchedCards > 0 && fetchedCards === totalCards) {
+            exportButton.disabled = cardElements.size === 0;
+            clearButton.disabled = cardElements.size === 0;
+        }
+    }
+
+    function cardKey(name) {
+        return name.trim().replace(/\s+/g, ' ').toLowerCase();
+    }
+
+    function isPending(card) {
+        return card.status === 'queued' || card.status === 'queue full';
+    }
+
+    function renderCard(key, card) {
+        const template = document.createElement('template');
+        template.innerHTML = (isPending(card) ? createPendingHtml(card) : createCardHtml(card)).trim();
+        const element = template.content.firstElementChild;
+        const existing = cardElements.get(key);
+        if (existing) {
+            existing.replaceWith(element);
+        } else {
+            cardList.appendChild(element);
+        }
+        cardElements.set(key, element);
+    }
+
+    function removeCard(key) {
+        const element = cardElements.get(key);
+        if (element) {
+            element.remove();
+            cardElements.delete(key);
+        }
+    }
+
+    function resolveCard(query, card) {
+        // A typo or single face resolves to a differently named card,
+        // so the placeholder for the query has to go
+        const queryKey = cardKey(query);
+        const key = cardKey(card.name);
+        if (queryKey !== key) {
+            removeCard(queryKey);
+        }
+        renderCard(key, card);
+        if (pendingNames.delete(queryKey)) {
+            fetchedCards = totalCards - pendingNames.size;
+            if (pendingNames.size === 0 && isFetching) {
+                isFetching = false;
                 displayMessage('Card fetching complete!', 'success');
             }
         }
+        updateProgress();
+    }
+
+    function applyResults(cardNames, results) {
+        results.forEach((card, index) => {
+            const query = cardNames[index];
+            const early = earlyResults.get(cardKey(query));
+            if (early) {
+                resolveCard(query, early);
+            } else if (isPending(card)) {
+                // Names refused with 'queue full' are retried after the server's Retry-After
+                pendingNames.set(cardKey(query), query);
+                renderCard(cardKey(query), card);
+            } else {
+                resolveCard(query, card);
+            }
+        });
+    }
+
+    function resetCards() {
+        cardList.innerHTML = '';
+        cardElements.clear();
+        pendingNames.clear();
+        fetchedCards = 0;
+        totalCards = 0;
+        isFetching = false;
+        updateProgress();
+    }
+
+    function createPendingHtml(card) {
+        return `<div class="card-item">
+                <h3>${escapeHtml(card.name)}</h3>
+                <p><strong>Status:</strong> ${escapeHtml(card.status)}</p>
+            </div>`;
     }
 
     function createCardHtml(card) {
@@ -79,21 +169,35 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // API Interaction Functions
-    async function fetchCards(cardNames) {
+    async function fetchCards(cardNames, options = {}) {
         try {
             console.log('Sending fetch request with card names:', cardNames);
-            const response = await fetch('/fetch', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ card_names: cardNames }),
-            });
-            if (!response.ok) {
+            const body = JSON.stringify({ card_names: cardNames, ...options });
+            const headers = { 'Content-Type': 'application/json' };
+            const previous = etags.get(body);
+            if (previous) {
+                headers['If-None-Match'] = previous.etag;
+            }
+            const response = await fetch('/fetch', { method: 'POST', headers, body });
+            if (response.status === 304) {
+                return previous.data;
+            }
+            // A 503 still carries results for the names that were accepted
+            if (!response.ok && response.status !== 503) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             const data = await response.json();
             console.log('Received response from server:', data);
+            const etag = response.headers.get('ETag');
+            if (etag && response.ok) {
+                if (etags.size >= 20) {
+                    etags.delete(etags.keys().next().value);
+                }
+                etags.set(body, { etag, data });
+            }
+            if (response.status === 503) {
+                scheduleRetry(Number(response.headers.get('Retry-After')) || 5);
+            }
             return data;
         } catch (error) {
             console.error('Error in fetchCards:', error);
@@ -101,15 +205,37 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    async function getStatus() {
+    function scheduleRetry(seconds) {
+        if (retryTimer) return;
+        displayMessage(`Queue is busy, retrying in ${seconds} seconds.`, 'error');
+        retryTimer = setTimeout(() => {
+            retryTimer = null;
+            syncCards();
+        }, seconds * 1000);
+    }
+
+    async function getChanges(since) {
         try {
-            const response = await fetch('/status');
+            const response = await fetch(`/cards/since?since=${encodeURIComponent(since)}`);
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             return await response.json();
         } catch (error) {
-            console.error('Error in getStatus:', error);
+            console.error('Error in getChanges:', error);
+            throw error;
+        }
+    }
+
+    async function getJob(jobId, path = '') {
+        try {
+            const response = await fetch(`/jobs/${jobId}${path}`);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return await response.json();
+        } catch (error) {
+            console.error('Error in getJob:', error);
             throw error;
         }
     }
@@ -128,41 +254,48 @@ document.addEventListener('DOMContentLoaded', function() {
         isFetching = true;
         totalCards = cardNames.length;
         fetchedCards = 0;
+        pendingNames.clear();
+        earlyResults.clear();
         updateProgress();
 
         try {
-            const data = await fetchCards(cardNames);
+            const data = await fetchCards(cardNames, { job: true });
             console.log('Fetch response data:', data);
-            if (Array.isArray(data)) {
-                displayMessage(`Queued ${data.length} cards for fetching.`, 'success');
-                updateCardList(data);
-                pollStatus();
+            if (data && Array.isArray(data.results)) {
+                displayMessage(`Queued ${data.results.length} cards for fetching.`, 'success');
+                applyResults(cardNames, data.results);
+                fetchedCards = totalCards - pendingNames.size;
+                if (pendingNames.size === 0) {
+                    isFetching = false;
+                } else if (!window.EventSource) {
+                    pollStatus(data.job.job_id, Array.from(new Set(cardNames)));
+                }
             } else {
                 throw new Error('Unexpected response format from server');
             }
         } catch (error) {
             console.error('Error:', error);
             displayMessage('Error fetching cards. Please try again.', 'error');
-        } finally {
             isFetching = false;
+        } finally {
             updateProgress();
         }
 
         cardNamesTextarea.value = '';
     }
 
-    async function pollStatus() {
+    async function pollStatus(jobId, jobNames) {
+        // Fallback for browsers without EventSource: poll the job's small
+        // progress record and download its results once it is complete
         try {
-            const status = await getStatus();
-            console.log('Status:', status);
-            fetchedCards = status.cache_size;
-            updateProgress();
-            if (status.queue_size > 0 || status.is_fetching) {
-                await updateCardList();
-                setTimeout(pollStatus, 1000);
+            const job = await getJob(jobId);
+            if (job.status === 'complete') {
+                const data = await getJob(jobId, '/results');
+                applyResults(jobNames, data.results);
             } else {
-                isFetching = false;
+                fetchedCards = Math.min(job.completed, totalCards);
                 updateProgress();
+                setTimeout(() => pollStatus(jobId, jobNames), 1000);
             }
         } catch (error) {
             console.error('Error in pollStatus:', error);
@@ -172,25 +305,45 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    async function updateCardList() {
+    async function syncCards() {
         try {
-            const cards = await fetchCards([]);  // Fetch all cached cards
-            cardList.innerHTML = cards.map(card => {
-                if (card.status === 'queued' || card.status === 'queue full') {
-                    return `<div class="card-item">
-                        <h3>${escapeHtml(card.name)}</h3>
-                        <p><strong>Status:</strong> ${escapeHtml(card.status)}</p>
-                    </div>`;
-                } else {
-                    return createCardHtml(card);
-                }
-            }).join('');
+            // Only cards changed since the last sync; a reset means the cursor was too old
+            const delta = await getChanges(cursor);
+            if (delta.reset) {
+                Array.from(cardElements.keys())
+                    .filter(key => !pendingNames.has(key))
+                    .forEach(removeCard);
+            }
+            delta.removed.forEach(removeCard);
+            delta.cards.forEach(card => renderCard(cardKey(card.name), card));
+            cursor = delta.cursor;
+            // Re-asking for pending names is cheap: already queued names are not queued twice
+            const queries = Array.from(pendingNames.values());
+            if (queries.length > 0) {
+                applyResults(queries, await fetchCards(queries));
+            }
+            updateProgress();
         } catch (error) {
             console.error('Error updating card list:', error);
             displayMessage('Error updating card list.', 'error');
         }
     }
 
+    function connectEvents() {
+        const eventSource = new EventSource('/events');
+        // Sent on every (re)connect; events missed while disconnected are recovered by a full sync
+        eventSource.addEventListener('status', () => syncCards());
+        eventSource.addEventListener('card', event => {
+            const data = JSON.parse(event.data);
+            if (isFetching) {
+                earlyResults.set(cardKey(data.query), data.card);
+            }
+            resolveCard(data.query, data.card);
+        });
+        eventSource.addEventListener('clear', () => resetCards());
+        eventSource.onerror = error => console.error('Event stream error:', error);
+    }
+
     async function handleExportClick() {
         try {
             const response = await fetch('/export', {
@@ -224,10 +377,7 @@ document.addEventListener('DOMContentLoaded', function() {
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            cardList.innerHTML = '';
-            fetchedCards = 0;
-            totalCards = 0;
-            updateProgress();
+            resetCards();
             displayMessage('All cards cleared.', 'success');
         } catch (error) {
             console.error('Error clearing cards:', error);
@@ -241,5 +391,9 @@ document.addEventListener('DOMContentLoaded', function() {
     clearButton.addEventListener('click', handleClearClick);
 
     // Initial setup
-    pollStatus();
+    if (window.EventSource) {
+        connectEvents();
+    } else {
+        syncCards();
+    }
 });
\ No newline at end of file
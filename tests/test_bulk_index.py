@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+from bulk_index import iter_json_array
+
+CARDS = [
+    {'name': 'Lightning Bolt', 'oracle_text': 'Lightning Bolt deals 3 damage to any target.'},
+    {'name': 'Fire // Ice', 'oracle_text': 'Brackets ] and braces } inside strings, commas too'},
+    {'name': 'Æther Vial', 'mana_cost': '{1}', 'card_faces': [{'name': 'a'}, {'name': 'b'}]},
+]
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 16, 1 << 20])
+def test_objects_split_across_chunks(chunk_size):
+    text = json.dumps(CARDS, indent=2, ensure_ascii=False)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == CARDS
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 20])
+def test_compact_array_with_whitespace(chunk_size):
+    text = '  \n[' + ' ,\n'.join(json.dumps(card) for card in CARDS) + ' ]\n'
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == CARDS
+
+def test_non_objects_are_skipped():
+    text = '[1, "two", {"name": "Sol Ring"}, null]'
+    assert list(iter_json_array(io.StringIO(text), 4)) == [{'name': 'Sol Ring'}]
+
+def test_empty_array():
+    assert list(iter_json_array(io.StringIO('[]'))) == []
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('{"object": "list"}')))
+
+def test_truncated_file():
+    text = json.dumps(CARDS)[:-20]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), 8))
@@ -0,0 +1,86 @@
+import pytest
+
+from app import CardCache, CardData, TrackedTLRUCache, TrackedTTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_ttl_cache_reports_capacity_evictions_and_expiry():
+    evicted = []
+    cache = TrackedTTLCache(2, 10, evicted.append)
+    cache['a'] = 1
+    cache['b'] = 2
+    cache['c'] = 3
+    assert evicted == ['a']
+    cache.expire(cache.timer() + 11)
+    assert sorted(evicted) == ['a', 'b', 'c']
+    del evicted[:]
+    cache['d'] = 4
+    del cache['d']
+    assert evicted == []
+
+def test_ttl_cache_peek_keeps_lru_order():
+    evicted = []
+    cache = TrackedTTLCache(2, 10, evicted.append)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.peek('a') == 1
+    cache['c'] = 3
+    assert evicted == ['a']
+
+def test_tlru_cache_reports_capacity_evictions_and_expiry():
+    evicted = []
+    cache = TrackedTLRUCache(2, lambda key, value, now: now + value, evicted.append)
+    cache['a'] = 100
+    cache['b'] = 100
+    cache['c'] = 5
+    assert evicted == ['a']
+    cache.expire(cache.timer() + 6)
+    assert evicted == ['a', 'c']
+    assert cache.peek('b') == 100
+
+def test_tlru_cache_peek_keeps_lru_order():
+    evicted = []
+    cache = TrackedTLRUCache(2, lambda key, value, now: now + 100, evicted.append)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.peek('a') == 1
+    cache['c'] = 3
+    assert evicted == ['a']
+
+@pytest.fixture
+def card_cache():
+    return CardCache(maxsize=3, ttl=1000, soft_ttl=100, alias_maxsize=10, tombstone_limit=10,
+                     negative_maxsize=10, not_found_ttl=0.05, error_ttl=0.05)
+
+def test_paging_does_not_change_eviction_order(card_cache):
+    for name in ('A', 'B', 'C'):
+        card_cache.put(name, CardData(name))
+    cards, _ = card_cache.page(None, 10)
+    assert [card.name for card in cards] == ['A', 'B', 'C']
+    card_cache.put('D', CardData('D'))
+    assert 'a' not in card_cache.keys()
+
+def test_negative_expiry_is_a_change(card_cache):
+    card_cache.put('Nope', CardData('Nope', found=False))
+    cursor = card_cache.cursor()
+    etag = card_cache.etag()
+    assert [card.name for card in card_cache.values()] == ['Nope']
+    card_cache.negative.expire(card_cache.negative.timer() + 1)
+    assert card_cache.etag() != etag
+    delta = card_cache.changes_since(cursor)
+    assert not delta['reset']
+    assert delta['removed'] == ['nope']
+
+def test_cursor_from_another_epoch_resets(card_cache):
+    card_cache.put('A', CardData('A'))
+    other = CardCache(3, 1000, 100, 10, 10, 10, 60, 60)
+    other.put('A', CardData('A'))
+    assert card_cache.changes_since(other.cursor())['reset']
+    assert not card_cache.changes_since(card_cache.cursor())['reset']
+    with pytest.raises(ValueError):
+        card_cache.changes_since('abc')
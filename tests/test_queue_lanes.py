@@ -0,0 +1,93 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app import FairLane, LaneQueue, QueueItem, WeightedLanes
+
+WEIGHTS = {'interactive': 8, 'bulk': 2, 'background': 1}
+
+def drain(queue):
+    items = []
+    while len(queue):
+        items.append(queue.popleft())
+    return items
+
+def test_fair_lane_serves_clients_round_robin():
+    lane = FairLane()
+    for name in ('a1', 'a2', 'a3'):
+        lane.append(QueueItem(name, 'bulk', 'a'))
+    lane.append(QueueItem('b1', 'bulk', 'b'))
+    lane.append(QueueItem('c1', 'bulk', 'c'))
+    assert [item.name for item in drain(lane)] == ['a1', 'b1', 'c1', 'a2', 'a3']
+
+def test_fair_lane_keeps_each_client_in_order():
+    lane = FairLane()
+    for i in range(5):
+        lane.append(QueueItem(f"a{i}", 'bulk', 'a'))
+        lane.append(QueueItem(f"b{i}", 'bulk', 'b'))
+    names = [item.name for item in drain(lane)]
+    assert [name for name in names if name[0] == 'a'] == [f"a{i}" for i in range(5)]
+    assert [name for name in names if name[0] == 'b'] == [f"b{i}" for i in range(5)]
+
+def test_fair_lane_empty():
+    lane = FairLane()
+    assert len(lane) == 0
+    with pytest.raises(IndexError):
+        lane.popleft()
+
+def test_weighted_lanes_share_by_weight():
+    lanes = WeightedLanes(WEIGHTS)
+    for lane in WEIGHTS:
+        for i in range(100):
+            lanes.append(QueueItem(f"{lane} {i}", lane))
+    first = [item.lane for item in (lanes.popleft() for _ in range(11 * 5))]
+    assert Counter(first) == {'interactive': 40, 'bulk': 10, 'background': 5}
+    assert first[0] == 'interactive'
+
+def test_weighted_lanes_never_starve_a_lane():
+    lanes = WeightedLanes(WEIGHTS)
+    for i in range(50):
+        lanes.append(QueueItem(f"interactive {i}", 'interactive'))
+    lanes.append(QueueItem('background 0', 'background'))
+    assert 'background' in [lanes.popleft().lane for _ in range(sum(WEIGHTS.values()))]
+
+def test_weighted_lanes_single_lane_is_fifo():
+    lanes = WeightedLanes(WEIGHTS)
+    for i in range(5):
+        lanes.append(QueueItem(str(i), 'bulk'))
+    assert [item.name for item in drain(lanes)] == ['0', '1', '2', '3', '4']
+
+def test_weighted_lanes_emptied_lane_keeps_no_credit():
+    lanes = WeightedLanes({'a': 1, 'b': 1})
+    for i in range(4):
+        lanes.append(QueueItem(f"a{i}", 'a'))
+    drain(lanes)
+    for i in range(2):
+        lanes.append(QueueItem(f"a{i}", 'a'))
+        lanes.append(QueueItem(f"b{i}", 'b'))
+    assert [item.lane for item in drain(lanes)] in (['a', 'b', 'a', 'b'], ['b', 'a', 'b', 'a'])
+
+def test_weighted_lanes_track_client_sizes():
+    lanes = WeightedLanes(WEIGHTS)
+    lanes.append(QueueItem('x', 'bulk', 'a'))
+    lanes.append(QueueItem('y', 'interactive', 'a'))
+    lanes.append(QueueItem('z', 'bulk', 'b'))
+    assert lanes.client_sizes == {'a': 2, 'b': 1}
+    drain(lanes)
+    assert lanes.client_sizes == {}
+    with pytest.raises(IndexError):
+        lanes.popleft()
+
+def test_lane_queue_orders_gets_by_lane():
+    async def run():
+        queue = LaneQueue(0, WEIGHTS)
+        for i in range(3):
+            queue.put_nowait(QueueItem(f"bulk {i}", 'bulk', 'a'))
+        queue.put_nowait(QueueItem('interactive 0', 'interactive', 'b'))
+        assert queue.lane_sizes() == {'interactive': 1, 'bulk': 3, 'background': 0}
+        assert queue.client_size('a') == 3
+        assert queue.client_count() == 2
+        return [(await queue.get()).name for _ in range(4)]
+
+    assert asyncio.run(run()) == ['interactive 0', 'bulk 0', 'bulk 1', 'bulk 2']
@@ -0,0 +1,70 @@
+import pytest
+
+import app
+from app import KeyedRateLimiter, RateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(app.time, 'monotonic', clock)
+    return clock
+
+def test_burst_then_denied(clock):
+    limiter = RateLimiter(limit=10, period=60, burst=3)
+    assert [limiter.is_allowed() for _ in range(4)] == [True, True, True, False]
+
+def test_retry_after_is_one_interval_once_the_burst_is_spent(clock):
+    limiter = RateLimiter(limit=10, period=60, burst=3)
+    for _ in range(3):
+        limiter.is_allowed()
+    assert not limiter.is_allowed()
+    assert limiter.retry_after() == pytest.approx(6.0)
+    clock.now += 5.9
+    assert not limiter.is_allowed()
+    clock.now += 0.1
+    assert limiter.is_allowed()
+    assert not limiter.is_allowed()
+
+def test_retry_after_is_zero_while_allowed(clock):
+    limiter = RateLimiter(limit=10, period=60, burst=3)
+    assert limiter.retry_after() == 0.0
+    limiter.is_allowed()
+    assert limiter.retry_after() == 0.0
+
+def test_steady_rate_is_always_allowed(clock):
+    limiter = RateLimiter(limit=10, period=60, burst=1)
+    for _ in range(50):
+        assert limiter.is_allowed()
+        clock.now += 6.0
+
+def test_denied_requests_do_not_consume(clock):
+    limiter = RateLimiter(limit=10, period=60, burst=2)
+    limiter.is_allowed()
+    limiter.is_allowed()
+    for _ in range(100):
+        assert not limiter.is_allowed()
+    clock.now += 6.0
+    assert limiter.is_allowed()
+
+def test_idle_time_refills_up_to_the_burst_only(clock):
+    limiter = RateLimiter(limit=10, period=60, burst=3)
+    limiter.is_allowed()
+    clock.now += 3600
+    assert [limiter.is_allowed() for _ in range(4)] == [True, True, True, False]
+
+def test_burst_defaults_to_limit(clock):
+    limiter = RateLimiter(limit=5, period=60)
+    assert sum(limiter.is_allowed() for _ in range(10)) == 5
+
+def test_keyed_limiter_keeps_a_bucket_per_client(clock):
+    limiter = KeyedRateLimiter(limit=10, period=60, burst=1)
+    assert limiter.get('a').is_allowed()
+    assert not limiter.get('a').is_allowed()
+    assert limiter.get('b').is_allowed()
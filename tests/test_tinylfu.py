@@ -0,0 +1,125 @@
+from tinylfu import CountMinSketch, WTinyLFUCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_cache(maxsize=100, ttl=1000.0):
+    clock = FakeClock()
+    evicted = []
+    cache = WTinyLFUCache(maxsize, ttl, evicted.append, timer=clock)
+    return cache, clock, evicted
+
+def test_sketch_counts_and_saturates():
+    sketch = CountMinSketch(64)
+    for _ in range(3):
+        sketch.increment('a')
+    assert sketch.frequency('a') >= 3
+    assert sketch.frequency('never seen') <= sketch.frequency('a')
+    for _ in range(100):
+        sketch.increment('b')
+    assert sketch.frequency('b') == CountMinSketch.MAX_COUNT
+
+def test_sketch_reset_halves_counts():
+    sketch = CountMinSketch(64)
+    for _ in range(8):
+        sketch.increment('a')
+    before = sketch.frequency('a')
+    sketch.reset()
+    assert sketch.frequency('a') == before // 2
+
+def test_scan_does_not_flush_popular_keys():
+    cache, _, evicted = make_cache(maxsize=100)
+    popular = [f"popular {i}" for i in range(50)]
+    for key in popular:
+        cache[key] = key
+    for _ in range(5):
+        for key in popular:
+            assert cache[key] == key
+    for i in range(1000):
+        cache[f"scan {i}"] = i
+    assert all(key in cache for key in popular)
+    assert len(cache) <= 100
+    assert len(evicted) > 0
+
+def test_frequent_candidate_displaces_victim():
+    cache, _, _ = make_cache(maxsize=10)
+    for i in range(10):
+        cache[f"old {i}"] = i
+    # The sketch counts misses too, so a key asked for often gets admitted
+    for _ in range(5):
+        cache.get('newcomer')
+    cache['newcomer'] = 'value'
+    for i in range(cache.window_size):
+        cache[f"filler {i}"] = i
+    assert 'newcomer' in cache
+
+def test_capacity_eviction_reports_each_key_once():
+    cache, _, evicted = make_cache(maxsize=20)
+    for i in range(200):
+        cache[i] = i
+    assert len(cache) == 20
+    assert len(evicted) == 180
+    assert len(set(evicted)) == 180
+    assert not set(evicted) & set(cache.keys())
+
+def test_entries_expire_after_ttl():
+    cache, clock, evicted = make_cache(ttl=10.0)
+    cache['a'] = 1
+    clock.now = 5.0
+    cache['b'] = 2
+    clock.now = 10.0
+    assert 'a' not in cache
+    assert cache.get('a') is None
+    assert evicted == ['a']
+    assert cache['b'] == 2
+    clock.now = 15.0
+    assert cache.expire() == [('b', 2)]
+    assert evicted == ['a', 'b']
+    assert len(cache) == 0
+
+def test_rewrite_restarts_the_ttl():
+    cache, clock, _ = make_cache(ttl=10.0)
+    cache['a'] = 1
+    clock.now = 8.0
+    cache['a'] = 2
+    clock.now = 15.0
+    assert cache['a'] == 2
+
+def test_delete_is_not_an_eviction():
+    cache, _, evicted = make_cache()
+    cache['a'] = 1
+    del cache['a']
+    assert 'a' not in cache
+    assert evicted == []
+
+def test_contains_and_peek_have_no_side_effects():
+    cache, _, _ = make_cache(maxsize=100)
+    for i in range(50):
+        cache[i] = i
+    rows = [bytes(row) for row in cache.sketch.rows]
+    segments = (list(cache.window), list(cache.probation), list(cache.protected))
+    assert 0 in cache
+    assert cache.peek(0) == 0
+    assert [bytes(row) for row in cache.sketch.rows] == rows
+    assert (list(cache.window), list(cache.probation), list(cache.protected)) == segments
+
+def test_probation_hit_is_promoted():
+    cache, _, _ = make_cache(maxsize=100)
+    for i in range(10):
+        cache[i] = i
+    key = next(iter(cache.probation))
+    assert cache[key] == key
+    assert key in cache.protected
+
+def test_clear():
+    cache, _, evicted = make_cache()
+    for i in range(10):
+        cache[i] = i
+    cache.clear()
+    assert len(cache) == 0
+    assert list(cache) == []
+    assert evicted == []
@@ -0,0 +1,181 @@
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+class CountMinSketch:
+    # Approximate access counts in four rows of 4-bit counters. Every counter
+    # is halved once sample_size increments have been recorded, so old
+    # popularity fades and the counts follow the recent workload.
+    DEPTH: int = 4
+    SEEDS: Tuple[int, ...] = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAX_COUNT: int = 15
+
+    def __init__(self, capacity: int):
+        width: int = 1
+        while width < max(capacity, 16):
+            width <<= 1
+        self.mask: int = width - 1
+        self.rows: List[bytearray] = [bytearray(width) for _ in range(self.DEPTH)]
+        self.sample_size: int = 10 * max(capacity, 16)
+        self.additions: int = 0
+
+    def indexes(self, key: Any) -> List[int]:
+        h: int = hash(key)
+        return [((((h ^ seed) * 0x2545F4914F6CDD1D) & 0xFFFFFFFFFFFFFFFF) >> 32) & self.mask for seed in self.SEEDS]
+
+    def frequency(self, key: Any) -> int:
+        return min(row[i] for row, i in zip(self.rows, self.indexes(key)))
+
+    def increment(self, key: Any) -> None:
+        added: bool = False
+        for row, i in zip(self.rows, self.indexes(key)):
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+                added = True
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self.reset()
+
+    def reset(self) -> None:
+        for row in self.rows:
+            row[:] = bytes(count >> 1 for count in row)
+        self.additions //= 2
+
+class WTinyLFUCache(MutableMapping):
+    # Window TinyLFU: new keys enter a small LRU window; when it overflows, the
+    # key leaving the window only displaces the main cache's eviction victim if
+    # the sketch has seen it more often, so a scan of one-off keys cannot flush
+    # popular ones. The main cache is a segmented LRU split into probation and
+    # protected parts. Expiry is lazy, with the same on_evict contract as
+    # TrackedTTLCache: called for capacity evictions and expiry, not deletes.
+    def __init__(self, maxsize: int, ttl: float, on_evict: Optional[Callable[[Any], None]] = None,
+                 window_ratio: float = 0.01, protected_ratio: float = 0.8,
+                 timer: Callable[[], float] = time.monotonic):
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.on_evict: Optional[Callable[[Any], None]] = on_evict
+        self.timer: Callable[[], float] = timer
+        self.window_size: int = max(1, int(maxsize * window_ratio))
+        self.main_size: int = max(1, maxsize - self.window_size)
+        self.protected_size: int = max(1, int(self.main_size * protected_ratio))
+        self.window: OrderedDict[Any, Any] = OrderedDict()
+        self.probation: OrderedDict[Any, Any] = OrderedDict()
+        self.protected: OrderedDict[Any, Any] = OrderedDict()
+        # Keys in insertion order; with a single TTL that is also expiry order
+        self.expires: OrderedDict[Any, float] = OrderedDict()
+        self.sketch: CountMinSketch = CountMinSketch(maxsize)
+
+    def segment(self, key: Any) -> Optional[OrderedDict[Any, Any]]:
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                return segment
+        return None
+
+    def __getitem__(self, key: Any) -> Any:
+        self.sketch.increment(key)
+        segment: Optional[OrderedDict[Any, Any]] = self.segment(key)
+        if segment is None:
+            raise KeyError(key)
+        if self.expires[key] <= self.timer():
+            self.evict(key, segment)
+            raise KeyError(key)
+        if segment is self.probation:
+            value: Any = self.probation.pop(key)
+            self.protected[key] = value
+            if len(self.protected) > self.protected_size:
+                demoted, demoted_value = self.protected.popitem(last=False)
+                self.probation[demoted] = demoted_value
+            return value
+        segment.move_to_end(key)
+        return segment[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.expire()
+        self.expires[key] = self.timer() + self.ttl
+        self.expires.move_to_end(key)
+        segment: Optional[OrderedDict[Any, Any]] = self.segment(key)
+        if segment is not None:
+            segment[key] = value
+            segment.move_to_end(key)
+            return
+        self.window[key] = value
+        if len(self.window) > self.window_size:
+            self.admit(*self.window.popitem(last=False))
+
+    def admit(self, candidate: Any, value: Any) -> None:
+        if len(self.probation) + len(self.protected) < self.main_size:
+            self.probation[candidate] = value
+            return
+        victims: OrderedDict[Any, Any] = self.probation or self.protected
+        victim: Any = next(iter(victims))
+        if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+            self.evict(victim, victims)
+            self.probation[candidate] = value
+        else:
+            del self.expires[candidate]
+            if self.on_evict is not None:
+                self.on_evict(candidate)
+
+    def evict(self, key: Any, segment: OrderedDict[Any, Any]) -> None:
+        del segment[key]
+        del self.expires[key]
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+    def __delitem__(self, key: Any) -> None:
+        segment: Optional[OrderedDict[Any, Any]] = self.segment(key)
+        if segment is None:
+            raise KeyError(key)
+        del segment[key]
+        del self.expires[key]
+
+    def __contains__(self, key: Any) -> bool:
+        # Membership tests neither count as an access nor reorder anything
+        expires_at: Optional[float] = self.expires.get(key)
+        return expires_at is not None and expires_at > self.timer()
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.expires)
+
+    def expire(self, time: Optional[float] = None) -> List[Tuple[Any, Any]]:
+        now: float = self.timer() if time is None else time
+        expired: List[Tuple[Any, Any]] = []
+        while self.expires:
+            key, expires_at = next(iter(self.expires.items()))
+            if expires_at > now:
+                break
+            segment: Optional[OrderedDict[Any, Any]] = self.segment(key)
+            if segment is not None:
+                expired.append((key, segment[key]))
+                self.evict(key, segment)
+            else:
+                del self.expires[key]
+        return expired
+
+    def keys(self) -> List[Any]:  # type: ignore[override]
+        self.expire()
+        return list(self.expires)
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        return [value for _, value in self.items()]
+
+    def items(self) -> List[Tuple[Any, Any]]:  # type: ignore[override]
+        self.expire()
+        return [(key, self.peek(key)) for key in self.expires]
+
+    def peek(self, key: Any) -> Any:
+        segment: Optional[OrderedDict[Any, Any]] = self.segment(key)
+        if segment is None:
+            raise KeyError(key)
+        return segment[key]
+
+    def clear(self) -> None:
+        self.window.clear()
+        self.probation.clear()
+        self.protected.clear()
+        self.expires.clear()